@@ -34,6 +34,7 @@ typedef SSIZE_T ssize_t;
 #include "paddle/fluid/framework/convert_utils.h"
 #include "paddle/fluid/framework/custom_operator.h"
 #include "paddle/fluid/framework/custom_operator_utils.h"
+#include "paddle/fluid/framework/data_type.h"
 #include "paddle/fluid/framework/phi_utils.h"
 #include "paddle/fluid/framework/python_headers.h"
 #include "paddle/fluid/memory/allocation/allocator.h"
@@ -224,6 +225,52 @@ static PyObject* eager_api_tensor_copy(PyObject* self,
   EAGER_CATCH_AND_THROW_RETURN_NULL
 }
 
+// Returns the tensor to be used as the source of `Tensor._to`. If the tensor
+// is on GPU and there is not enough GPU memory to hold its casted copy, the
+// tensor is copied to CPU and released from GPU, otherwise it is returned as
+// it is. The copy is always blocking since the source is released right after
+// it.
+static PyObject* eager_api_copy_to_with_fallback(PyObject* self,
+                                                 PyObject* args,
+                                                 PyObject* kwargs) {
+  EAGER_TRY
+  PyObject* src_obj = PyTuple_GET_ITEM(args, 0);
+  paddle::Tensor& src = reinterpret_cast<TensorObject*>(src_obj)->tensor;
+  auto dtype = CastPyArg2ProtoType(PyTuple_GET_ITEM(args, 1), 1);
+
+#if defined(PADDLE_WITH_CUDA) || defined(PADDLE_WITH_HIP)
+  if (phi::is_gpu_place(src.place())) {
+    // Note(weilong wu): Paddle GPU minimum memory allocation unit is 256
+    // bytes, waiting_alloc_memory will compute the memory space occupied by
+    // 'src'. Coefficient 1.2 is used to avoid OOM that may occur in this
+    // critical state when the memory is just enough.
+    size_t size_dtype = framework::SizeOfType(dtype);
+    double waiting_alloc_memory =
+        (static_cast<double>(src.numel() * size_dtype) / 256 + 1) * 256 * 1.2;
+    size_t available = 0;
+    size_t total = 0;
+    platform::GpuMemoryUsage(&available, &total);
+    if (static_cast<double>(available) < waiting_alloc_memory) {
+      paddle::Tensor cp_tensor;
+      {
+        eager_gil_scoped_release guard;
+        cp_tensor = src.copy_to(phi::CPUPlace(), true);
+        egr::EagerUtils::autograd_meta(&cp_tensor)->SetStopGradient(true);
+        egr::EagerUtils::autograd_meta(&cp_tensor)
+            ->SetPersistable(
+                egr::EagerUtils::autograd_meta(&(src))->Persistable());
+        // Release memory of src
+        src.reset();
+      }
+      return ToPyObject(cp_tensor);
+    }
+  }
+#endif
+  Py_INCREF(src_obj);
+  return src_obj;
+  EAGER_CATCH_AND_THROW_RETURN_NULL
+}
+
 PyObject* eager_api_get_all_grads(PyObject* self,
                                   PyObject* args,
                                   PyObject* kwargs) {
@@ -1381,6 +1428,10 @@ PyMethodDef variable_functions[] = {  // NOLINT
      (PyCFunction)(void (*)())eager_api_tensor_copy,
      METH_VARARGS | METH_KEYWORDS,
      nullptr},
+    {"copy_to_with_fallback",
+     (PyCFunction)(void (*)())eager_api_copy_to_with_fallback,
+     METH_VARARGS | METH_KEYWORDS,
+     nullptr},
     {"get_all_grads",
      (PyCFunction)(void (*)())eager_api_get_all_grads,
      METH_VARARGS | METH_KEYWORDS,
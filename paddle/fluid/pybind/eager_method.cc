@@ -607,25 +607,97 @@ static void IncreaseTensorReferenceCountUntilCopyComplete(
   gc->DirectClearCallback(callback);
 }
 
+// Copies self to place. The copy keeps the persistable of self, and its
+// stop_gradient is taken from self if keep_stop_gradient, otherwise True.
+static paddle::Tensor CopyTensorToPlace(TensorObject* self,
+                                        const platform::Place& place,
+                                        bool blocking,
+                                        bool keep_stop_gradient) {
+  eager_gil_scoped_release guard;
+  paddle::Tensor cp_tensor = self->tensor.copy_to(place, blocking);
+  if (!blocking) {
+    IncreaseTensorReferenceCountUntilCopyComplete(self->tensor, place);
+  }
+  auto* self_meta = egr::EagerUtils::autograd_meta(&(self->tensor));
+  auto* cp_meta = egr::EagerUtils::autograd_meta(&cp_tensor);
+  cp_meta->SetStopGradient(keep_stop_gradient ? self_meta->StopGradient()
+                                              : true);
+  cp_meta->SetPersistable(self_meta->Persistable());
+  return cp_tensor;
+}
+
 static PyObject* tensor_method__copy_to(TensorObject* self,
                                         PyObject* args,
                                         PyObject* kwargs) {
   EAGER_TRY
   auto place = CastPyArg2Place(PyTuple_GET_ITEM(args, 0), 0);
   bool blocking = CastPyArg2AttrBoolean(PyTuple_GET_ITEM(args, 1), 1);
-  paddle::Tensor cp_tensor;
+  return ToPyObject(CopyTensorToPlace(self, place, blocking, false));
+  EAGER_CATCH_AND_THROW_RETURN_NULL
+}
+
+// Same as _copy_to, but the copied tensor keeps the stop_gradient of self
+// instead of being set to True, which is used by Tensor.cpu/cuda/pin_memory.
+static PyObject* tensor_method__copy_to_with_attrs(TensorObject* self,
+                                                   PyObject* args,
+                                                   PyObject* kwargs) {
+  EAGER_TRY
+  auto place = CastPyArg2Place(PyTuple_GET_ITEM(args, 0), 0);
+  bool blocking = CastPyArg2AttrBoolean(PyTuple_GET_ITEM(args, 1), 1);
+  return ToPyObject(CopyTensorToPlace(self, place, blocking, true));
+  EAGER_CATCH_AND_THROW_RETURN_NULL
+}
+
+// Casts the tensor to dtype and copies it to place in one call. When copying
+// to cpu, the cast is done on the side where the data is smaller, so that the
+// intermediate tensor and the copied bytes are as small as possible.
+static PyObject* tensor_method__cast_and_copy_to(TensorObject* self,
+                                                 PyObject* args,
+                                                 PyObject* kwargs) {
+  EAGER_TRY
+  auto place = CastPyArg2Place(PyTuple_GET_ITEM(args, 0), 0);
+  auto dtype = framework::TransToPhiDataType(
+      CastPyArg2ProtoType(PyTuple_GET_ITEM(args, 1), 1));
+  bool blocking = CastPyArg2AttrBoolean(PyTuple_GET_ITEM(args, 2), 2);
+  paddle::Tensor out_tensor = self->tensor;
+  bool need_cast = out_tensor.dtype() != dtype;
+  bool need_copy = !platform::is_same_place(out_tensor.place(), place);
+  if (!need_cast && !need_copy) {
+    // return a shallow copy like detach, out_tensor shares the autograd meta
+    // of self and setting its stop_gradient below would change self
+    out_tensor = paddle::Tensor();
+    out_tensor.set_impl(self->tensor.impl());
+    out_tensor.set_name(egr::Controller::Instance().GenerateUniqueName());
+  }
   {
     eager_gil_scoped_release guard;
-    cp_tensor = self->tensor.copy_to(place, blocking);
-    if (!blocking) {
-      IncreaseTensorReferenceCountUntilCopyComplete(self->tensor, place);
+    // NOTE: casting after the copy is only done on cpu, which does not
+    // depend on the current device and has cast kernels for all dtypes.
+    // A non-blocking copy may still be in flight when the cpu cast runs,
+    // so the cast is always done first in that case.
+    bool cast_before_copy =
+        need_cast &&
+        (!need_copy || !blocking || !platform::is_cpu_place(place) ||
+         phi::SizeOf(dtype) <= phi::SizeOf(out_tensor.dtype()));
+    if (cast_before_copy) {
+      out_tensor = paddle::experimental::cast(out_tensor, dtype);
+    }
+    if (need_copy) {
+      paddle::Tensor src_tensor = out_tensor;
+      out_tensor = src_tensor.copy_to(place, blocking);
+      if (!blocking) {
+        IncreaseTensorReferenceCountUntilCopyComplete(src_tensor, place);
+      }
     }
-    egr::EagerUtils::autograd_meta(&cp_tensor)->SetStopGradient(true);
-    egr::EagerUtils::autograd_meta(&cp_tensor)
+    if (need_cast && !cast_before_copy) {
+      out_tensor = paddle::experimental::cast(out_tensor, dtype);
+    }
+    egr::EagerUtils::autograd_meta(&out_tensor)->SetStopGradient(true);
+    egr::EagerUtils::autograd_meta(&out_tensor)
         ->SetPersistable(
             egr::EagerUtils::autograd_meta(&(self->tensor))->Persistable());
   }
-  return ToPyObject(cp_tensor);
+  return ToPyObject(out_tensor);
   EAGER_CATCH_AND_THROW_RETURN_NULL
 }
 
@@ -1435,16 +1507,16 @@ static PyObject* tensor__getitem_dygraph(TensorObject* self,
   EAGER_CATCH_AND_THROW_RETURN_NULL
 }
 
-static PyObject* tensor__getitem_from_offset(TensorObject* self,
-                                             PyObject* args,
-                                             PyObject* kwargs) {
-  EAGER_TRY
+// Returns the DenseTensor of self, and the offset of the element given by the
+// coordinates in args.
+static const phi::DenseTensor& GetDenseTensorAndElementOffset(
+    TensorObject* self, PyObject* args, size_t* element_offset) {
   phi::DenseTensor* ptr = nullptr;
   if (self->tensor.is_selected_rows()) {
     auto* selected_rows =
         static_cast<phi::SelectedRows*>(self->tensor.impl().get());
     ptr = static_cast<phi::DenseTensor*>(selected_rows->mutable_value());
-  } else {
+  } else if (self->tensor.is_dense_tensor()) {
     ptr = static_cast<phi::DenseTensor*>(self->tensor.impl().get());
   }
   PADDLE_ENFORCE_NOT_NULL(ptr,
@@ -1501,6 +1573,16 @@ static PyObject* tensor__getitem_from_offset(TensorObject* self,
       offset += index * stride[i];
     }
   }
+  *element_offset = offset;
+  return tensor;
+}
+
+static PyObject* tensor__getitem_from_offset(TensorObject* self,
+                                             PyObject* args,
+                                             PyObject* kwargs) {
+  EAGER_TRY
+  size_t offset = 0;
+  const auto& tensor = GetDenseTensorAndElementOffset(self, args, &offset);
 #define PD_FOR_EACH_DENSE_TENSOR_DATA_TYPE(_) \
   _(bool, DataType::BOOL)                     \
   _(int8_t, DataType::INT8)                   \
@@ -1549,6 +1631,60 @@ static PyObject* tensor__getitem_from_offset(TensorObject* self,
   EAGER_CATCH_AND_THROW_RETURN_NULL
 }
 
+// Same as _getitem_from_offset, but returns the element as a Python scalar,
+// bfloat16 and float16 elements are converted to Python float.
+static PyObject* tensor__item_scalar(TensorObject* self,
+                                     PyObject* args,
+                                     PyObject* kwargs) {
+  EAGER_TRY
+  size_t offset = 0;
+  const auto& tensor = GetDenseTensorAndElementOffset(self, args, &offset);
+#define TENSOR_TO_PY_INT(T, data_type)                         \
+  if (tensor.dtype() == data_type) {                           \
+    return PyLong_FromLongLong(static_cast<int64_t>(           \
+        paddle::pybind::TensorGetElement<T>(tensor, offset))); \
+  }
+#define TENSOR_TO_PY_FLOAT(T, data_type)                       \
+  if (tensor.dtype() == data_type) {                           \
+    return PyFloat_FromDouble(static_cast<double>(             \
+        paddle::pybind::TensorGetElement<T>(tensor, offset))); \
+  }
+#define TENSOR_TO_PY_COMPLEX(T, data_type)                     \
+  if (tensor.dtype() == data_type) {                           \
+    T c = paddle::pybind::TensorGetElement<T>(tensor, offset); \
+    return PyComplex_FromDoubles(static_cast<double>(c.real),  \
+                                 static_cast<double>(c.imag)); \
+  }
+
+  if (tensor.dtype() == DataType::BOOL) {
+    return PyBool_FromLong(
+        paddle::pybind::TensorGetElement<bool>(tensor, offset));
+  }
+  if (tensor.dtype() == DataType::UINT64) {
+    return PyLong_FromUnsignedLongLong(
+        paddle::pybind::TensorGetElement<uint64_t>(tensor, offset));
+  }
+  TENSOR_TO_PY_INT(int8_t, DataType::INT8)
+  TENSOR_TO_PY_INT(uint8_t, DataType::UINT8)
+  TENSOR_TO_PY_INT(int16_t, DataType::INT16)
+  TENSOR_TO_PY_INT(uint16_t, DataType::UINT16)
+  TENSOR_TO_PY_INT(int32_t, DataType::INT32)
+  TENSOR_TO_PY_INT(uint32_t, DataType::UINT32)
+  TENSOR_TO_PY_INT(int64_t, DataType::INT64)
+  TENSOR_TO_PY_FLOAT(bfloat16, DataType::BFLOAT16)
+  TENSOR_TO_PY_FLOAT(float16, DataType::FLOAT16)
+  TENSOR_TO_PY_FLOAT(float, DataType::FLOAT32)
+  TENSOR_TO_PY_FLOAT(double, DataType::FLOAT64)
+  TENSOR_TO_PY_COMPLEX(complex64, DataType::COMPLEX64)
+  TENSOR_TO_PY_COMPLEX(complex128, DataType::COMPLEX128)
+#undef TENSOR_TO_PY_INT
+#undef TENSOR_TO_PY_FLOAT
+#undef TENSOR_TO_PY_COMPLEX
+  PADDLE_THROW(platform::errors::Unimplemented(
+      "Unsupported tensor data type: %s", tensor.dtype()));
+  EAGER_CATCH_AND_THROW_RETURN_NULL
+}
+
 static PyObject* tensor__setitem_dygraph(TensorObject* self,
                                          PyObject* args,
                                          PyObject* kwargs) {
@@ -2424,6 +2560,19 @@ static PyObject* tensor_method_is_sparse_coo(TensorObject* self,
   EAGER_CATCH_AND_THROW_RETURN_NULL
 }
 
+static PyObject* tensor_method__is_coalesced(TensorObject* self,
+                                             PyObject* args,
+                                             PyObject* kwargs) {
+  EAGER_TRY
+  if (!self->tensor.defined() || !self->tensor.is_sparse_coo_tensor()) {
+    return ToPyObject(false);
+  }
+  auto sparse_coo_tensor =
+      std::dynamic_pointer_cast<phi::SparseCooTensor>(self->tensor.impl());
+  return ToPyObject(sparse_coo_tensor->coalesced());
+  EAGER_CATCH_AND_THROW_RETURN_NULL
+}
+
 PyDoc_STRVAR(tensor_is_sparse_csr__doc__,
              R"DOC(is_sparse_csr($self, /)
 --
@@ -3087,6 +3236,14 @@ PyMethodDef variable_methods[] = {  // NOLINT
      (PyCFunction)(void (*)())tensor_method__copy_to,
      METH_VARARGS | METH_KEYWORDS,
      nullptr},
+    {"_copy_to_with_attrs",
+     (PyCFunction)(void (*)())tensor_method__copy_to_with_attrs,
+     METH_VARARGS | METH_KEYWORDS,
+     nullptr},
+    {"_cast_and_copy_to",
+     (PyCFunction)(void (*)())tensor_method__cast_and_copy_to,
+     METH_VARARGS | METH_KEYWORDS,
+     nullptr},
     {"copy_",
      (PyCFunction)(void (*)())tensor_method_copy_,
      METH_VARARGS | METH_KEYWORDS,
@@ -3163,6 +3320,10 @@ PyMethodDef variable_methods[] = {  // NOLINT
      (PyCFunction)(void (*)())tensor__getitem_from_offset,
      METH_VARARGS | METH_KEYWORDS,
      nullptr},
+    {"_item_scalar",
+     (PyCFunction)(void (*)())tensor__item_scalar,
+     METH_VARARGS | METH_KEYWORDS,
+     nullptr},
     {"_setitem_dygraph",
      (PyCFunction)(void (*)())tensor__setitem_dygraph,
      METH_VARARGS | METH_KEYWORDS,
@@ -3245,6 +3406,10 @@ PyMethodDef variable_methods[] = {  // NOLINT
      (PyCFunction)(void (*)())tensor_method_is_sparse_coo,
      METH_VARARGS | METH_KEYWORDS,
      tensor_is_sparse_coo__doc__},
+    {"_is_coalesced",
+     (PyCFunction)(void (*)())tensor_method__is_coalesced,
+     METH_VARARGS | METH_KEYWORDS,
+     nullptr},
     {"is_sparse_csr",
      (PyCFunction)(void (*)())tensor_method_is_sparse_csr,
      METH_VARARGS | METH_KEYWORDS,
@@ -214,6 +214,14 @@ void BindBlockDesc(pybind11::module *m) {
             return self.RemoveVar(name);
           },
           pybind11::return_value_policy::reference)
+      .def(
+          "_clone_var",
+          [](pd::BlockDesc &self, const pd::VarDesc &var) {
+            pd::VarDesc *new_var = self.Var(var.Name());
+            *new_var = var;
+            return new_var;
+          },
+          pybind11::return_value_policy::reference)
       .def("all_vars",
            &pd::BlockDesc::AllVars,
            pybind11::return_value_policy::reference)
@@ -1583,6 +1583,11 @@ All parameter, weight, gradient are variables in Paddle.
   m.def("has_infer_inplace", [](const std::string op_type) {
     return framework::OpInfoMap::Instance().Get(op_type).HasInferInplace();
   });
+  m.def("has_no_need_buffer_vars_inferer", [](const std::string op_type) {
+    return static_cast<bool>(framework::OpInfoMap::Instance()
+                                 .Get(op_type)
+                                 .NoNeedBufferVarsInferer());
+  });
   m.def("infer_no_need_buffer_slots",
         [](const std::string op_type,
            const framework::VariableNameMap &inputs,
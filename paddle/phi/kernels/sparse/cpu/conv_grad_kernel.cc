@@ -90,7 +90,7 @@ void Conv3dCooGradCPUKernel(const CPUContext& dev_ctx,
   memset(d_x_features_ptr, 0, sizeof(T) * d_x_features.numel());
   phi::Copy<CPUContext>(
       dev_ctx, x.indices(), dev_ctx.GetPlace(), false, &x_grad_indices);
-  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), true);
+  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), x.coalesced());
 
   std::vector<IntT> offsets(kernel_size + 1);
   IntT offset = 0;
@@ -60,6 +60,7 @@ void CopyCooValues(const Context& dev_ctx,
                    const SparseCooTensor& x,
                    SparseCooTensor* dx) {
   Copy(dev_ctx, x.indices(), dev_ctx.GetPlace(), false, dx->mutable_indices());
+  dx->SetCoalesced(x.coalesced());
 
   const int sparse_dim = x.sparse_dim();
   std::vector<IntT> sparse_offsets(sparse_dim), dout_indexs(dout.nnz()),
@@ -41,6 +41,7 @@ void FullLikeCooKernel(const Context& dev_ctx,
                      dev_ctx.GetPlace(),
                      false,
                      out->mutable_non_zero_indices());
+  out->SetCoalesced(x.coalesced());
 
   DenseTensor* values = out->mutable_non_zero_elements();
   values->Resize(x.non_zero_elements().dims());
@@ -66,7 +66,7 @@ void MaskCooCPUKernel(const CPUContext& dev_ctx,
     memcpy(out_values_ptr + i * cols, x_ptr + index * cols, cols * sizeof(T));
   }
 
-  out->SetMember(out_indices, out_values, dims, true);
+  out->SetMember(out_indices, out_values, dims, mask.coalesced());
 }
 
 /**
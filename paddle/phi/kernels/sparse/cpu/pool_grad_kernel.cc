@@ -48,7 +48,7 @@ void MaxPoolCooGradCPUKernel(const CPUContext& dev_ctx,
   // TODO(zhangkaihuo): call phi::sparse::EmptyLike
   DenseTensor x_grad_indices = phi::EmptyLike<IntT>(dev_ctx, x.indices());
   DenseTensor x_grad_values = phi::EmptyLike<T>(dev_ctx, x.values());
-  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), true);
+  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), x.coalesced());
   T* x_grad_ptr = x_grad_values.data<T>();
   memset(x_grad_ptr, 0, sizeof(T) * x_grad_values.numel());
   phi::Copy<CPUContext>(
@@ -106,6 +106,7 @@ void SoftmaxCooGradCPUKernel(const Context& dev_ctx,
   auto grad_nnz = dout.nnz();
 
   *(dx->mutable_indices()) = out_indices;
+  dx->SetCoalesced(out.coalesced());
   DenseTensor* values = dx->mutable_values();
   values->Resize(out_dims);
   values->set_meta(out_values.meta());
@@ -34,7 +34,8 @@ void TransposeCooKernel(const Context& dev_ctx,
   DDim out_dims = x.dims().transpose(perm);
   DenseTensor out_indices = EmptyLike<int64_t, Context>(dev_ctx, x.indices());
   const DenseTensor& out_values(x.values());
-  out->SetMember(out_indices, out_values, out_dims, x.coalesced());
+  // the permuted indices are not sorted any more
+  out->SetMember(out_indices, out_values, out_dims, false);
 
   // compute values of indices
   const DenseTensor& x_indices = x.indices();
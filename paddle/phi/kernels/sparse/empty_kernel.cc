@@ -27,6 +27,7 @@ void EmptyLikeCooKernel(const Context& dev_ctx,
                         const SparseCooTensor& x,
                         SparseCooTensor* out) {
   *(out->mutable_indices()) = x.indices();
+  out->SetCoalesced(x.coalesced());
 
   const DenseTensor& x_values = x.values();
   DenseTensor* out_values = out->mutable_values();
@@ -101,7 +101,7 @@ void Conv3dCooGradGPUKernel(const GPUContext& dev_ctx,
       d_x_features_ptr, 0, sizeof(T) * d_x_features.numel(), dev_ctx.stream());
   phi::Copy<GPUContext>(
       dev_ctx, x.indices(), dev_ctx.GetPlace(), false, &x_grad_indices);
-  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), true);
+  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), x.coalesced());
 
   std::vector<int> offsets(kernel_size + 1);
 
@@ -31,6 +31,7 @@ void FullLikeCooKernel(const Context& dev_ctx,
                        SparseCooTensor* out) {
   phi::Copy<Context>(
       dev_ctx, x.indices(), dev_ctx.GetPlace(), false, out->mutable_indices());
+  out->SetCoalesced(x.coalesced());
 
   DenseTensor* values = out->mutable_values();
   phi::Full<T, Context>(
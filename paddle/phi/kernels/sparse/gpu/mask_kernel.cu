@@ -64,7 +64,7 @@ void MaskCooGPUKernel(const GPUContext& dev_ctx,
   DenseTensor out_indices = phi::EmptyLike<IntT>(dev_ctx, indices);
   DenseTensor out_values = phi::EmptyLike<T>(dev_ctx, values);
   if (mask.nnz() <= 0) {
-    out->SetMember(out_indices, out_values, dims, true);
+    out->SetMember(out_indices, out_values, dims, mask.coalesced());
     return;
   }
 
@@ -103,7 +103,7 @@ void MaskCooGPUKernel(const GPUContext& dev_ctx,
           sparse_dim,
           out_values_ptr);
 
-  out->SetMember(out_indices, out_values, dims, true);
+  out->SetMember(out_indices, out_values, dims, mask.coalesced());
 }
 
 /**
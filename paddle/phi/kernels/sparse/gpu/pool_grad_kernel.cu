@@ -74,7 +74,7 @@ void MaxPoolCooGradGPUKernel(const GPUContext& dev_ctx,
   // TODO(zhangkaihuo): call phi::sparse::EmptyLike
   DenseTensor x_grad_indices = phi::EmptyLike<IntT>(dev_ctx, x.indices());
   DenseTensor x_grad_values = phi::EmptyLike<T>(dev_ctx, x.values());
-  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), true);
+  x_grad->SetMember(x_grad_indices, x_grad_values, x.dims(), x.coalesced());
   T* x_grad_ptr = x_grad_values.data<T>();
   phi::funcs::SetConstant<GPUContext, T> set_zero;
   set_zero(dev_ctx, &x_grad_values, static_cast<T>(0.0f));
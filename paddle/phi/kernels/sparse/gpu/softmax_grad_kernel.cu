@@ -199,6 +199,7 @@ void SoftmaxCooGradGPUKernel(const Context& dev_ctx,
   auto stream = dev_ctx.stream();
 
   *(dx->mutable_indices()) = out_indices;
+  dx->SetCoalesced(out.coalesced());
   DenseTensor* values = dx->mutable_values();
   values->Resize(out_dims);
   values->set_meta(out_values.meta());
@@ -15,13 +15,22 @@ limitations under the License. */
 #include "paddle/phi/kernels/sparse/sparse_utils_kernel.h"
 
 #include <thrust/execution_policy.h>
-#include <thrust/remove.h>
+#include <thrust/scan.h>
+
+#ifdef __NVCC__
+#include "cub/cub.cuh"
+#endif
+#ifdef __HIPCC__
+#include <hipcub/hipcub.hpp>
+namespace cub = hipcub;
+#endif
 
 #ifdef PADDLE_WITH_HIP
 #include "paddle/phi/backends/dynload/rocsparse.h"
 #endif
 #include "paddle/phi/backends/gpu/gpu_context.h"
 #include "paddle/phi/backends/gpu/gpu_launch_config.h"
+#include "paddle/phi/common/memory_utils.h"
 #include "paddle/phi/core/enforce.h"
 #include "paddle/phi/core/kernel_registry.h"
 #include "paddle/phi/core/tensor_meta.h"
@@ -45,53 +54,42 @@ inline __device__ bool DevIsZero(const T* data, const int64_t cols) {
   return true;
 }
 
+// mark every non zero row with 1, the marks are turned into the write
+// offsets of the rows by an exclusive scan
 template <typename T>
-__global__ void GetNonZeroNums(const T* dense_data,
-                               const int rows,
-                               const int cols,
-                               int* non_zero_num,
-                               int* temp_indexs) {
+__global__ void GetNonZeroFlags(const T* dense_data,
+                                const int rows,
+                                const int cols,
+                                int* offsets) {
   int tid = threadIdx.x + blockIdx.x * blockDim.x;
-  __shared__ int counter;
-  if (threadIdx.x == 0) counter = 0;
-  __syncthreads();
-
   for (int i = tid; i < rows; i += gridDim.x * blockDim.x) {
-    int index = -1;
     // TODO(zhangkaihuo): when cols=1, vectorization can be used
-    if (!DevIsZero(dense_data + i * cols, cols)) {
-      // use reductions?
-      atomicAdd(&counter, 1);
-      index = i;
-    }
-    temp_indexs[i] = index;
-  }
-  __syncthreads();
-  if (threadIdx.x == 0) {
-    atomicAdd(non_zero_num, counter);
+    offsets[i] = DevIsZero(dense_data + i * cols, cols) ? 0 : 1;
   }
 }
 
 template <typename T>
 __global__ void GetNonZeroElementsAndIndices(const T* dense_data,
+                                             const int rows,
                                              const int64_t sparse_dim,
                                              const int64_t cols,
                                              const int64_t* x_dims,
                                              const int non_zero_num,
-                                             const int* indexs,
+                                             const int* offsets,
                                              int64_t* indices,
                                              T* sparse_data) {
   int tid = threadIdx.x + blockIdx.x * blockDim.x;
-  for (int i = tid; i < non_zero_num; i += gridDim.x * blockDim.x) {
-    int64_t sparse_index = indexs[i];
-    int64_t x_index = sparse_index;
+  for (int i = tid; i < rows; i += gridDim.x * blockDim.x) {
+    const int out_index = offsets[i];
+    if (offsets[i + 1] == out_index) continue;
+    int64_t sparse_index = i;
     for (int64_t j = sparse_dim - 1; j >= 0; j--) {
-      indices[j * non_zero_num + i] = sparse_index % x_dims[j];
+      indices[j * non_zero_num + out_index] = sparse_index % x_dims[j];
       sparse_index /= x_dims[j];
     }
 
     for (int j = 0; j < cols; j++) {
-      sparse_data[i * cols + j] = dense_data[x_index * cols + j];
+      sparse_data[out_index * cols + j] = dense_data[i * cols + j];
     }
   }
 }
@@ -112,37 +110,43 @@ void DenseToCooKernel(const Context& dev_ctx,
   auto dims_2d = flatten_to_2d(x_dims, sparse_dim);
   const int rows = dims_2d[0];
   const int cols = dims_2d[1];
-  DenseTensor nums = phi::Empty<int32_t>(dev_ctx, {1});
   DenseTensor d_x_dims = phi::Empty<int64_t>(dev_ctx, {x_dims.size()});
 
-  // 1. get numbers of non zero elements, and get the index of non zero elements
-  int* nums_ptr = nums.data<int>();
+  // 1. mark the non zero rows and scan the marks into write offsets, the
+  // extra trailing slot receives the number of non zero rows
+  DenseTensor offsets = phi::Empty<int32_t>(dev_ctx, {rows + 1});
+  int* offsets_ptr = offsets.data<int>();
   phi::backends::gpu::GpuMemsetAsync(
-      nums_ptr, 0, sizeof(int), dev_ctx.stream());
+      offsets_ptr + rows, 0, sizeof(int), dev_ctx.stream());
   auto config = phi::backends::gpu::GetGpuLaunchConfig1D(dev_ctx, rows, 1);
 
-  DenseTensor temp_indexs = phi::Empty<int32_t>(dev_ctx, {rows});
-  int* temp_indexs_ptr = temp_indexs.data<int>();
-
-  GetNonZeroNums<<<config.block_per_grid.x,
-                   config.thread_per_block.x,
-                   0,
-                   dev_ctx.stream()>>>(
-      x_data, rows, cols, nums_ptr, temp_indexs_ptr);
-
-#ifdef PADDLE_WITH_HIP
-  thrust::remove(thrust::hip::par.on(dev_ctx.stream()),
-#else
-  thrust::remove(thrust::cuda::par.on(dev_ctx.stream()),
-#endif
-                 temp_indexs_ptr,
-                 temp_indexs_ptr + rows,
-                 -1);
+  GetNonZeroFlags<<<config.block_per_grid.x,
+                    config.thread_per_block.x,
+                    0,
+                    dev_ctx.stream()>>>(x_data, rows, cols, offsets_ptr);
+
+  size_t temp_storage_bytes = 0;
+  cub::DeviceScan::ExclusiveSum(nullptr,
+                                temp_storage_bytes,
+                                offsets_ptr,
+                                offsets_ptr,
+                                rows + 1,
+                                dev_ctx.stream());
+  auto d_temp_storage = phi::memory_utils::Alloc(
+      dev_ctx.GetPlace(),
+      temp_storage_bytes,
+      phi::Stream(reinterpret_cast<phi::StreamId>(dev_ctx.stream())));
+  cub::DeviceScan::ExclusiveSum(d_temp_storage->ptr(),
+                                temp_storage_bytes,
+                                offsets_ptr,
+                                offsets_ptr,
+                                rows + 1,
+                                dev_ctx.stream());
 
   // 2. copy non_zero_num to host, copy x_dims to device
   int non_zero_num = 0;
   phi::backends::gpu::GpuMemcpyAsync(&non_zero_num,
-                                     nums_ptr,
+                                     offsets_ptr + rows,
                                      sizeof(int),
                                      gpuMemcpyDeviceToHost,
                                      dev_ctx.stream());
@@ -163,18 +167,18 @@ void DenseToCooKernel(const Context& dev_ctx,
   values.Resize(values_dims);
   T* sparse_data = dev_ctx.template Alloc<T>(&values);
 
-  // 3. calc indices by indexs and get values by indexs
+  // 3. every non zero row writes its indices and values at its own offset
   if (non_zero_num > 0) {
-    config = phi::backends::gpu::GetGpuLaunchConfig1D(dev_ctx, non_zero_num, 1);
     GetNonZeroElementsAndIndices<<<config.block_per_grid.x,
                                    config.thread_per_block.x,
                                    0,
                                    dev_ctx.stream()>>>(x_data,
+                                                       rows,
                                                        sparse_dim,
                                                        cols,
                                                        d_x_dims.data<int64_t>(),
                                                        non_zero_num,
-                                                       temp_indexs_ptr,
+                                                       offsets_ptr,
                                                        indices_data,
                                                        sparse_data);
   }
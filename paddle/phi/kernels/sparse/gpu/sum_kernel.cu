@@ -267,7 +267,9 @@ void SumCooGPU1Kernel(const Context& dev_ctx,
   if (dtype != phi::DataType::UNDEFINED && dtype != x.dtype()) {
     out_values = phi::Cast<T, Context>(dev_ctx, out_values, dtype);
   }
-  out->SetMember(out_indices, out_values, out_dims, x.coalesced());
+  // the indices along the summed axis are dropped without merging, so they
+  // may be duplicated
+  out->SetMember(out_indices, out_values, out_dims, false);
 }
 
 template <typename T, typename Context>
@@ -136,6 +136,7 @@ void CastCooKernel(const Context& dev_ctx,
   const DenseTensor& x_values = x.non_zero_elements();
   DenseTensor* out_indices = out->mutable_indices();
   DenseTensor* out_values = out->mutable_non_zero_elements();
+  out->SetCoalesced(x.coalesced());
 
   if (index_dtype == DataType::UNDEFINED) {
     *out_indices = x_indices;
@@ -209,6 +210,7 @@ void IsnanCooKernel(const Context& dev_ctx,
                     const SparseCooTensor& x,
                     SparseCooTensor* out) {
   *(out->mutable_indices()) = x.indices();
+  out->SetCoalesced(x.coalesced());
   const DenseTensor& x_values = x.non_zero_elements();
   DenseTensor* out_values = out->mutable_non_zero_elements();
 
@@ -24,7 +24,7 @@ void ValuesCooGradKernel(const Context& dev_ctx UNUSED,
                          const SparseCooTensor& x,
                          const DenseTensor& out_grad,
                          SparseCooTensor* x_grad) {
-  x_grad->SetMember(x.indices(), out_grad, x.dims(), true);
+  x_grad->SetMember(x.indices(), out_grad, x.dims(), x.coalesced());
 }
 
 template <typename T, typename Context>
@@ -14,6 +14,7 @@
 
 import hashlib
 import inspect
+import itertools
 import sys
 import warnings
 
@@ -21,14 +22,11 @@ import numpy as np
 
 import paddle
 from paddle import _C_ops, profiler
-from paddle.base.data_feeder import (
-    _PADDLE_DTYPE_2_NUMPY_DTYPE,
-    convert_uint16_to_float,
-)
-from paddle.profiler.utils import in_profiler_mode
+from paddle.base.data_feeder import _PADDLE_DTYPE_2_NUMPY_DTYPE
+from paddle.profiler import utils as profiler_utils
 from paddle.utils import deprecated
 
-from .. import core, framework, unique_name
+from .. import core, framework
 from ..framework import (
     EagerParamBase,
     Parameter,
@@ -39,6 +37,185 @@ from .base import switch_to_static_graph
 from .math_op_patch import monkey_patch_math_tensor
 
 _grad_scalar = None
+# Whether the incompatible upgrade warning of `Tensor.grad` has been emitted.
+_grad_warned = False
+_grad_msg = (
+    'tensor.grad will return the tensor value of the gradient.'
+    ' This is an incompatible upgrade for tensor.grad API. '
+    ' It\'s return type changes from numpy.ndarray in version 2.0 to paddle.Tensor in version 2.1.0. '
+    ' If you want to get the numpy value of the gradient, you can use :code:`x.grad.numpy()`'
+)
+# ensure ANSI escape sequences print correctly in cmd and powershell
+if sys.platform.lower() == 'win32':
+    _GRAD_WARNING_MSG = "\nWarning:\n%s " % (_grad_msg)
+else:
+    _GRAD_WARNING_MSG = "\033[93m\nWarning:\n%s \033[0m" % (_grad_msg)
+# Shared empty grad tensors passed to `core.eager.run_backward`, which accepts
+# both list and tuple.
+_EMPTY_GRAD_TENSORS = ()
+
+# Note: getattr(self, attr, None) will call x.grad=x.gradient(), but gradient() only available in dygraph.
+# It will fail. So, for propery that different between dynamic and static graph, should not getattr(self, attr, None).
+_ATTR_NOT_NEED_KEYS = frozenset(
+    [
+        'grad',
+        'T',
+        'place',
+        '_place_str',
+        'data',
+        'grad_',
+        'strides',
+        'offset',
+    ]
+)
+# Cache of the public, non-method attribute names of a Tensor type, which is
+# used by `_to_static_var` to avoid scanning `dir(self)` on every call.
+_STATIC_ATTR_CACHE = {}
+
+_VALID_PLACE_TYPES = frozenset(
+    [
+        core.Place,
+        core.CPUPlace,
+        core.CUDAPlace,
+        core.CUDAPinnedPlace,
+        core.XPUPlace,
+        core.CustomPlace,
+    ]
+)
+# For the isinstance check of subclasses, which needs a tuple.
+_VALID_PLACE_TYPES_TUPLE = tuple(_VALID_PLACE_TYPES)
+# Cache of the places parsed from device strings in `Tensor._to`.
+_STR_TO_PLACE = {}
+
+
+def _convert_str_to_place(device):
+    place = _STR_TO_PLACE.get(device)
+    if place is None:
+        place = paddle.device._convert_to_place(device)
+        # NOTE: device strings without an explicit id (e.g. 'gpu') are resolved
+        # from environment variables, so only cache the unambiguous ones.
+        if ':' in device or device.lower() == 'cpu':
+            _STR_TO_PLACE[device] = place
+    return place
+
+
+# `paddle.distributed` imports this module indirectly, so it is imported on
+# first use and kept here.
+_distributed = None
+
+
+def _get_distributed():
+    global _distributed
+    if _distributed is None:
+        import paddle.distributed as dist
+
+        _distributed = dist
+    return _distributed
+
+
+# The default main program and its global block last returned by `Tensor.block`.
+_main_program_block = (None, None)
+
+
+def _list_index_to_tensor(index):
+    # A flat list of python int is converted to a contiguous int64 array at
+    # once, the others (bool, Tensor, nested lists) are left to to_tensor.
+    if index and all(type(item) is int for item in index):
+        array = np.asarray(index)
+        # ints out of the int64 range give a uint64, float64 or object array
+        if array.dtype.kind == 'i':
+            return paddle.to_tensor(array.astype(np.int64, copy=False))
+    return paddle.to_tensor(index)
+
+
+def _ndarray_index_to_tensor(index):
+    return paddle.to_tensor(index)
+
+
+def _range_index_to_tensor(index):
+    return paddle.to_tensor(
+        np.arange(index.start, index.stop, index.step, dtype=np.int64)
+    )
+
+
+# Index items that are passed to `_getitem_dygraph` and `_setitem_dygraph`
+# as they are.
+_FAST_INDEX_TYPES = frozenset([int, bool, slice, type(None), type(Ellipsis)])
+
+# Converters of the index items that `Tensor.__getitem__` and
+# `Tensor.__setitem__` turn into Tensor, keyed by the exact type of the item.
+# The types in `_FAST_INDEX_TYPES` map to None.
+_INDEX_TO_TENSOR = {
+    list: _list_index_to_tensor,
+    tuple: _list_index_to_tensor,
+    np.ndarray: _ndarray_index_to_tensor,
+    range: _range_index_to_tensor,
+}
+_INDEX_TO_TENSOR.update(dict.fromkeys(_FAST_INDEX_TYPES))
+
+
+# Places shared by `Tensor.cpu`, `Tensor.cuda` and `Tensor.pin_memory`, they
+# are created on first use since CUDAPlace and CUDAPinnedPlace can not be
+# created in CPU only version.
+_cpu_place = None
+_cuda_pinned_place = None
+_CUDA_PLACE_CACHE = {}
+
+
+def _get_cpu_place():
+    global _cpu_place
+    if _cpu_place is None:
+        _cpu_place = core.CPUPlace()
+    return _cpu_place
+
+
+def _get_cuda_pinned_place():
+    global _cuda_pinned_place
+    if _cuda_pinned_place is None:
+        _cuda_pinned_place = core.CUDAPinnedPlace()
+    return _cuda_pinned_place
+
+
+def _get_cuda_place(device_id):
+    place = _CUDA_PLACE_CACHE.get(device_id)
+    if place is None:
+        place = core.CUDAPlace(device_id)
+        _CUDA_PLACE_CACHE[device_id] = place
+    return place
+
+
+if sys.version_info >= (3, 9):
+
+    def _md5(data):
+        # the md5sum is not used for security, which allows the faster md5
+        # implementation in FIPS mode
+        return hashlib.md5(data, usedforsecurity=False)
+
+else:
+    _md5 = hashlib.md5
+
+# Suffix counter for the names of deep copied tensors, `next` on it is atomic
+# under the GIL, so no lock is taken as `unique_name.generate` does.
+_deepcopy_counter = itertools.count()
+
+
+_TO_VALID_KEYS = frozenset(["device", "dtype", "blocking", "other"])
+_TO_VALID_DTYPES = frozenset(
+    [
+        "bfloat16",
+        "float16",
+        "float32",
+        "float64",
+        "int8",
+        "int16",
+        "int32",
+        "int64",
+        "uint8",
+        "complex64",
+        "complex128",
+        "bool",
+    ]
+)
 
 
 class TensorHookRemoveHelper:
@@ -47,6 +224,8 @@ class TensorHookRemoveHelper:
     NOTE(wuweilong):the operation weakref.ref(tensor) will cause some unexpected errors in eager mode.
     """
 
+    __slots__ = ['_tensor', '_hook_id']
+
     def __init__(self, tensor, hook_id):
         self._tensor = tensor
         self._hook_id = hook_id
@@ -76,6 +255,12 @@ _already_patch_repr = False
 
 
 def monkey_patch_tensor():
+    # bind the frequently called framework functions to closure variables,
+    # which are cheaper to look up in the patched methods than module attributes
+    _in_dygraph_mode = framework.in_dygraph_mode
+    _current_expected_place = framework._current_expected_place
+    _convert_np_dtype_to_dtype = convert_np_dtype_to_dtype_
+
     @switch_to_static_graph
     def _to_static_var(self, to_parameter=False, **kwargs):
         """
@@ -103,36 +288,50 @@ def monkey_patch_tensor():
                 ...     static_var = tensor._to_static_var()
         """
 
-        # Note: getattr(self, attr, None) will call x.grad=x.gradient(), but gradient() only available in dygraph.
-        # It will fail. So, for propery that different between dynamic and static graph, should not getattr(self, attr, None).
-        attr_not_need_keys = [
-            'grad',
-            'T',
-            'place',
-            '_place_str',
-            'data',
-            'grad_',
-            'strides',
-            'offset',
-        ]
-        param_keys = ['stop_gradient', 'trainable']
         if isinstance(self, EagerParamBase):
-            attr_kwargs = self.__dict__.copy()
-            for key in param_keys:
-                attr_kwargs[key] = getattr(self, key)
+            attr_kwargs = {
+                **self.__dict__,
+                'stop_gradient': self.stop_gradient,
+                'trainable': self.trainable,
+                'block': self.block,
+                'shape': self.shape,
+                'dtype': self.dtype,
+                'type': self.type,
+                'name': self.name,
+                'persistable': self.persistable,
+            }
         else:
-            attr_names = []
-            for name in dir(self):
-                if name not in attr_not_need_keys:
-                    if not inspect.ismethod(
-                        getattr(self, name)
-                    ) and not name.startswith('_'):
-                        attr_names.append(name)
+            tensor_type = type(self)
+            attr_names = _STATIC_ATTR_CACHE.get(tensor_type)
+            if attr_names is None:
+                attr_names = tuple(
+                    name
+                    for name in dir(tensor_type)
+                    if name not in _ATTR_NOT_NEED_KEYS
+                    and not name.startswith('_')
+                    and not inspect.ismethod(getattr(self, name))
+                )
+                _STATIC_ATTR_CACHE[tensor_type] = attr_names
             attr_kwargs = {name: getattr(self, name) for name in attr_names}
-
-        attr_keys = ['block', 'shape', 'dtype', 'type', 'name', 'persistable']
-        for attr in attr_keys:
-            attr_kwargs[attr] = getattr(self, attr, None)
+            # attributes set on the instance are not shared by the type
+            for name, attr in getattr(self, '__dict__', {}).items():
+                if (
+                    name not in _ATTR_NOT_NEED_KEYS
+                    and not name.startswith('_')
+                    and not inspect.ismethod(attr)
+                ):
+                    attr_kwargs[name] = attr
+
+            attr_keys = [
+                'block',
+                'shape',
+                'dtype',
+                'type',
+                'name',
+                'persistable',
+            ]
+            for attr in attr_keys:
+                attr_kwargs[attr] = getattr(self, attr, None)
 
         # If specify block, use it instead of self.block
         if 'block' in kwargs:
@@ -149,8 +348,7 @@ def monkey_patch_tensor():
             static_var = Variable(**attr_kwargs)
 
         if self.dist_attr is not None:  # import for shard tensor api
-            import paddle.distributed as dist
-
+            dist = _get_distributed()
             static_var = dist.shard_tensor(
                 static_var,
                 self.dist_attr.process_mesh,
@@ -189,35 +387,44 @@ def monkey_patch_tensor():
                 ...     out = linear(t)  # call with different weight
         """
         base_tensor = core.eager.Tensor
-        assert isinstance(
-            value, (np.ndarray, base_tensor, dict, str)
+        supported_types = (np.ndarray, base_tensor, dict, str)
+        # check the exact type first, subclasses fall back to isinstance
+        value_type = type(value)
+        if value_type not in supported_types:
+            value_type = next(
+                (t for t in supported_types if isinstance(value, t)), None
+            )
+        assert (
+            value_type is not None
         ), "Variable set_value function, arguments type only support Variable, numpy, Tensor, dict, string."
         if self.is_dist():
-            assert isinstance(
-                value, (np.ndarray, base_tensor)
+            assert (
+                value_type is np.ndarray or value_type is base_tensor
             ), "For set_value function of dist tensor, arguments type only support numpy or Tensor."
 
-        if isinstance(value, (dict, str)):
+        if value_type is dict or value_type is str:
             assert len(self) == len(
                 value
             ), "Variable length not match, Variable [ {} ] need tensor with length {} but load set tensor with length {}".format(
                 self.name, len(self), len(value)
             )
-            if isinstance(value, dict):
+            if value_type is dict:
                 self.value().set_vocab(value)
             else:
                 self.value().set_string_list(value)
         else:
-            assert self.shape == list(
-                value.shape
+            self_shape = self.shape
+            value_shape = value.shape
+            assert len(self_shape) == len(value_shape) and all(
+                s == v for s, v in zip(self_shape, value_shape)
             ), "Variable Shape not match, Variable [ {} ] need tensor with shape {} but load set tensor with shape {}".format(
-                self.name, self.shape, value.shape
+                self.name, self_shape, value_shape
             )
 
-            if isinstance(value, base_tensor):
+            if value_type is base_tensor:
                 dtype = value.dtype
             else:
-                dtype = convert_np_dtype_to_dtype_(value.dtype)
+                dtype = _convert_np_dtype_to_dtype(value.dtype)
 
             assert (
                 self.dtype == dtype
@@ -230,14 +437,12 @@ def monkey_patch_tensor():
             # this Interface behavior will be unifed in the future.
             if self.is_dist():
                 # calling set method bound for DistTensor
-                value = paddle.distributed.shard_tensor(
+                value = _get_distributed().shard_tensor(
                     value, self.value().process_mesh, self.value().placements
                 )
                 self.value().get_tensor().set(value.get_tensor())
                 return
-            self.value().get_tensor().set(
-                value, framework._current_expected_place()
-            )
+            self.value().get_tensor().set(value, _current_expected_place())
 
     @framework.dygraph_only
     def backward(self, grad_tensor=None, retain_graph=False):
@@ -302,13 +507,15 @@ def monkey_patch_tensor():
                 4: Tensor(shape=[], dtype=float32, place=Place(cpu), stop_gradient=False,
                 5000.)
         """
-        if framework.in_dygraph_mode():
-            if in_profiler_mode():
+        if _in_dygraph_mode():
+            if profiler_utils._is_profiler_used:
                 record_event = profiler.RecordEvent(
                     "Gradient Backward", profiler.TracerEventType.Backward
                 )
                 record_event.begin()
-            if grad_tensor is not None:
+            if grad_tensor is None:
+                grad_tensor = _EMPTY_GRAD_TENSORS
+            else:
                 assert isinstance(
                     grad_tensor, core.eager.Tensor
                 ), "The type of grad_tensor must be paddle.Tensor"
@@ -318,10 +525,6 @@ def monkey_patch_tensor():
                 ), "Tensor shape not match, Tensor of grad_tensor [ {} ] with shape {} mismatch Tensor [ {} ] with shape {}".format(
                     grad_tensor.name, grad_tensor.shape, self.name, self.shape
                 )
-
-            if grad_tensor is None:
-                grad_tensor = []
-            else:
                 grad_tensor = [grad_tensor]
             if _grad_scalar:
                 # When using amp with Fleet DistributedStrategy, we do loss scaling implicitly.
@@ -329,7 +532,7 @@ def monkey_patch_tensor():
 
             core.eager.run_backward([self], grad_tensor, retain_graph)
 
-            if in_profiler_mode():
+            if profiler_utils._is_profiler_used:
                 record_event.end()
         else:
             raise ValueError(
@@ -451,16 +654,9 @@ def monkey_patch_tensor():
 
         if device is not None:
             if isinstance(device, str):
-                device = paddle.device._convert_to_place(device)
-            elif isinstance(
-                device,
-                (
-                    core.CPUPlace,
-                    core.CUDAPlace,
-                    core.CUDAPinnedPlace,
-                    core.XPUPlace,
-                    core.CustomPlace,
-                ),
+                device = _convert_str_to_place(device)
+            elif type(device) in _VALID_PLACE_TYPES or isinstance(
+                device, _VALID_PLACE_TYPES_TUPLE
             ):
                 pass
             else:
@@ -481,55 +677,34 @@ def monkey_patch_tensor():
                 device = t.place
             if dtype is None:
                 dtype = t.dtype
-            if type(dtype) is str:
-                dtype = framework.convert_np_dtype_to_dtype_(dtype)
-
-            # 1. gpu place need to determine whether the memory is sufficient for allocation.
-            if t.place.is_gpu_place():
-                size_dtype = core.size_of_dtype(dtype)
-                # Note(weilong wu): Paddle GPU minimum memory allocation unit is 256 bytes,
-                # waiting_alloc_memory will compute the memory space occupied by 't'.
-                # Coefficient 1.2 is used to avoid OOM that may occur in this critical state when the memory is just enough.
-                waiting_alloc_memory = (
-                    ((t._numel() * size_dtype) / 256 + 1) * 256 * 1.2
-                )
-                gpu_memory_available = core.gpu_memory_available()
-                if gpu_memory_available < waiting_alloc_memory:
-                    # Copy Tensor to cpu
-                    t_used = t._copy_to(paddle.CPUPlace(), blocking)
-                    # Release memory of t
-                    t._clear()
-                else:
-                    # Tensor still in GPU
-                    t_used = t
-            else:
-                t_used = t
+            if not isinstance(dtype, core.VarDesc.VarType):
+                # str and np.dtype, the copy functions only accept VarType
+                dtype = _convert_np_dtype_to_dtype(dtype)
 
-            # 2. cast Tensor to dtype
-            if dtype is not None and dtype != t_used.dtype:
+            # 0. nothing to do if t is already on device with dtype
+            if dtype == t.dtype and t.place._equals(device):
+                return t
+
+            # 1. gpu place need to determine whether the memory is sufficient for allocation,
+            # if not, t will be copied to cpu and its gpu memory will be released.
+            t_used = core.eager.copy_to_with_fallback(t, dtype)
+
+            # 2. cast Tensor to dtype and copy it to device
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=UserWarning)
                 with paddle.base.framework._dygraph_place_guard(
                     place=t_used.place
                 ):
-                    t_casted = t_used.cast(dtype=dtype)
-            else:
-                t_casted = t_used
+                    new_t = t_used._cast_and_copy_to(device, dtype, blocking)
 
-            # 3. Copy casted Tensor(in CPU or GPU) to device
-            if device is not None and not t_casted.place._equals(device):
-                new_t = t_casted._copy_to(device, blocking)
-            else:
-                new_t = t_casted
-
-            # 4. Share Tensor to origin Tensor
+            # 3. Share Tensor to origin Tensor
             dst_tensor = t.value().get_tensor()
             src_tensor = new_t.value().get_tensor()
             dst_tensor._share_data_with(src_tensor)
 
             return t
 
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=UserWarning)
-            return transform(self, device, dtype, blocking)
+        return transform(self, device, dtype, blocking)
 
     @framework.dygraph_only
     def to(self, *args, **kwargs):
@@ -583,9 +758,7 @@ def monkey_patch_tensor():
 
         def get_device_dtype_from_tensor(other):
             if other is not None:
-                device = str(other.place)[6:-1]
-                dtype = other.dtype
-                return device, dtype
+                return other.place, other.dtype
             else:
                 return None, None
 
@@ -597,22 +770,7 @@ def monkey_patch_tensor():
                 * (Union[str, paddle.dtype, numpy.dtype] dtype, bool blocking)\n \
                 * (paddle.Tensor other, bool blocking) "
             )
-        valid_keys = {"device", "dtype", "blocking", "other"}
-        valid_dtypes = [
-            "bfloat16",
-            "float16",
-            "float32",
-            "float64",
-            "int8",
-            "int16",
-            "int32",
-            "int64",
-            "uint8",
-            "complex64",
-            "complex128",
-            "bool",
-        ]
-        invalid_keys = set(kwargs.keys()) - valid_keys
+        invalid_keys = kwargs.keys() - _TO_VALID_KEYS
         if len(invalid_keys) != 0:
             raise TypeError(
                 "to() got an unexpected keyword argument "
@@ -628,7 +786,7 @@ def monkey_patch_tensor():
             elif (
                 isinstance(args[0], (paddle.dtype, np.dtype))
                 or isinstance(args[0], str)
-                and args[0].lower() in valid_dtypes
+                and args[0].lower() in _TO_VALID_DTYPES
             ):
                 dtype = args[0]
                 if size_args == 2:
@@ -678,17 +836,10 @@ def monkey_patch_tensor():
                 grad of x: Tensor(shape=[], dtype=float32, place=CUDAPlace(0), stop_gradient=False, 500.)
 
         """
-        msg = (
-            'tensor.grad will return the tensor value of the gradient.'
-            ' This is an incompatible upgrade for tensor.grad API. '
-            ' It\'s return type changes from numpy.ndarray in version 2.0 to paddle.Tensor in version 2.1.0. '
-            ' If you want to get the numpy value of the gradient, you can use :code:`x.grad.numpy()`'
-        )
-        warning_msg = "\033[93m\nWarning:\n%s \033[0m" % (msg)
-        # ensure ANSI escape sequences print correctly in cmd and powershell
-        if sys.platform.lower() == 'win32':
-            warning_msg = "\nWarning:\n%s " % (msg)
-        warnings.warn(warning_msg)
+        global _grad_warned
+        if not _grad_warned:
+            _grad_warned = True
+            warnings.warn(_GRAD_WARNING_MSG)
         return self._grad_ivar()
 
     def clear_grad(self):
@@ -747,10 +898,7 @@ def monkey_patch_tensor():
                 3.299999952316284
 
         """
-        scalar = self._getitem_from_offset(*args)
-        if scalar.dtype == np.uint16:
-            return convert_uint16_to_float(scalar).item()
-        return scalar.item()
+        return self._item_scalar(*args)
 
     @property
     def inplace_version(self):
@@ -815,23 +963,33 @@ def monkey_patch_tensor():
                 2.)
         """
         new_tensor = core.eager.Tensor()
-        new_tensor.name = self.name + unique_name.generate("_deepcopy")
+        new_tensor.name = f"{self.name}_deepcopy_{next(_deepcopy_counter)}"
         memo[id(self)] = new_tensor
         new_tensor.copy_(self, True)
         return new_tensor
 
     @property
     def block(self):
-        return framework.default_main_program().global_block()
+        global _main_program_block
+        program = framework._main_program_
+        cached_program, global_block = _main_program_block
+        if program is not cached_program:
+            global_block = program.global_block()
+            _main_program_block = (program, global_block)
+        return global_block
 
     def __nonzero__(self):
-        # np.prod([]) -> np.float64, so use int
-        numel = int(np.prod(self.shape))
+        numel = 1
+        for dim in self.shape:
+            numel *= dim
         assert (
             numel == 1
         ), "When Variable is used as the condition of if/while , Variable can only contain one element."
         assert self._is_initialized(), "tensor not initialized"
-        return bool(np.array(self) > 0)
+        if self.is_dist():
+            # item() only reads local DenseTensor data, numpy() reshards first
+            return bool(np.array(self) > 0)
+        return bool(self.item() > 0)
 
     def __bool__(self):
         return self.__nonzero__()
@@ -861,23 +1019,36 @@ def monkey_patch_tensor():
         """
         array = self.numpy(False)
         if dtype:
-            array = array.astype(dtype)
+            array = array.astype(dtype, copy=False)
         return array
 
     def pre_deal_index_and_value(self, item, value=None):
         # since in pybind there is no effiency way to transfer Py_Tuple/Py_List/Py_Range to Tensor
         # we call this function in python level.
-        item = list(item) if isinstance(item, tuple) else [item]
-        for i, slice_item in enumerate(item):
-            if isinstance(slice_item, (list, np.ndarray, tuple)):
-                item[i] = paddle.to_tensor(slice_item)
-            elif isinstance(slice_item, range):
-                item[i] = paddle.to_tensor(list(slice_item))
+        if type(item) in _FAST_INDEX_TYPES:
+            item = (item,)
+        elif type(item) is not tuple or not all(
+            type(slice_item) in _FAST_INDEX_TYPES for slice_item in item
+        ):
+            item = list(item) if isinstance(item, tuple) else [item]
+            for i, slice_item in enumerate(item):
+                item_type = type(slice_item)
+                if item_type in _INDEX_TO_TENSOR:
+                    to_tensor = _INDEX_TO_TENSOR[item_type]
+                elif isinstance(slice_item, (list, tuple)):
+                    to_tensor = _list_index_to_tensor
+                elif isinstance(slice_item, np.ndarray):
+                    to_tensor = _ndarray_index_to_tensor
+                else:
+                    to_tensor = None
+                if to_tensor is not None:
+                    item[i] = to_tensor(slice_item)
+            item = tuple(item)
 
         if value is not None and not isinstance(value, Variable):
             value = paddle.to_tensor(value, dtype=self.dtype)
 
-        return tuple(item), value
+        return item, value
 
     def __getitem__(self, item):
         item, _ = pre_deal_index_and_value(self, item)
@@ -942,39 +1113,38 @@ def monkey_patch_tensor():
         if self.place.is_cpu_place():
             return self
         else:
-            res = self._copy_to(core.CPUPlace(), True)
-            res.stop_gradient = self.stop_gradient
-            res.persistable = self.persistable
-            return res
+            return self._copy_to_with_attrs(_get_cpu_place(), True)
 
     @framework.dygraph_only
     def cuda(self, device_id=None, blocking=True):
         if device_id is None:
-            res_place = framework._current_expected_place()
+            res_place = _current_expected_place()
             if not isinstance(res_place, core.CUDAPlace):
-                res_place = core.CUDAPlace(0)
+                res_place = _get_cuda_place(0)
         elif isinstance(device_id, int):
-            res_place = core.CUDAPlace(device_id)
+            res_place = _get_cuda_place(device_id)
         else:
             raise ValueError("device_id must be int|None")
 
-        if self.place._equals(res_place):
+        place = self.place
+        if place._equals(res_place):
             return self
+        elif not blocking and place.is_cpu_place():
+            # NOTE: copy from pageable host memory to gpu is synchronous, so the
+            # tensor is staged in pinned memory to make the copy asynchronous.
+            # The pinned memory comes from the caching allocator of
+            # CUDAPinnedPlace and is kept alive until the copy completes.
+            pinned = self._copy_to_with_attrs(_get_cuda_pinned_place(), True)
+            return pinned._copy_to_with_attrs(res_place, False)
         else:
-            res = self._copy_to(res_place, blocking)
-            res.stop_gradient = self.stop_gradient
-            res.persistable = self.persistable
-            return res
+            return self._copy_to_with_attrs(res_place, blocking)
 
     @framework.dygraph_only
     def pin_memory(self, blocking=True):
         if self.place.is_cuda_pinned_place():
             return self
         else:
-            res = self._copy_to(core.CUDAPinnedPlace(), blocking)
-            res.stop_gradient = self.stop_gradient
-            res.persistable = self.persistable
-            return res
+            return self._copy_to_with_attrs(_get_cuda_pinned_place(), blocking)
 
     @framework.dygraph_only
     def values(self):
@@ -1077,12 +1247,14 @@ def monkey_patch_tensor():
                 >>> print(x._md5sum())
                 >>> #'1f68049372c5b2a4e0d049044450
         """
-        numpy_array = np.array(self)
-        array_bytes = numpy_array.tobytes()
-        return hashlib.md5(array_bytes).hexdigest()
+        numpy_array = self.numpy(False)
+        if not numpy_array.flags.c_contiguous:
+            numpy_array = np.ascontiguousarray(numpy_array)
+        # hash the buffer of the array directly instead of a bytes copy of it
+        return _md5(numpy_array).hexdigest()
 
     def __hash__(self):
-        return hash(id(self))
+        return id(self)
 
     @framework.dygraph_only
     def coalesce(self, name=None):
@@ -1114,11 +1286,14 @@ def monkey_patch_tensor():
                 Tensor(shape=[2], dtype=float32, place=Place(cpu), stop_gradient=True,
                 [3., 3.])
         """
+        if self._is_coalesced():
+            return self
         return _C_ops.sparse_coalesce(self)
 
     if not hasattr(core, "eager"):
         return
 
+    tensor_type = core.eager.Tensor
     for method_name, method in (
         ("__bool__", __bool__),
         ("__nonzero__", __nonzero__),
@@ -1157,7 +1332,7 @@ def monkey_patch_tensor():
         ("_use_gpudnn", _use_gpudnn),
         ("_md5sum", _md5sum),
     ):
-        setattr(core.eager.Tensor, method_name, method)
+        setattr(tensor_type, method_name, method)
 
     global _already_patch_repr
     if not _already_patch_repr:
@@ -1165,17 +1340,18 @@ def monkey_patch_tensor():
         # So, we need to overwrite it to a more readable one.
         # See details in https://github.com/pybind/pybind11/issues/2537.
         origin = core.VarDesc.VarType.__str__
+        dtype_strs = {
+            dtype: 'paddle.'
+            + ('bfloat16' if numpy_dtype == 'uint16' else numpy_dtype)
+            for dtype, numpy_dtype in _PADDLE_DTYPE_2_NUMPY_DTYPE.items()
+        }
 
         def dtype_str(dtype):
-            if dtype in _PADDLE_DTYPE_2_NUMPY_DTYPE:
-                numpy_dtype = _PADDLE_DTYPE_2_NUMPY_DTYPE[dtype]
-                if numpy_dtype == 'uint16':
-                    numpy_dtype = 'bfloat16'
-                prefix = 'paddle.'
-                return prefix + numpy_dtype
-            else:
+            s = dtype_strs.get(dtype)
+            if s is None:
                 # for example, paddle.base.core.VarDesc.VarType.LOD_TENSOR
                 return origin(dtype)
+            return s
 
         core.VarDesc.VarType.__str__ = dtype_str
         _already_patch_repr = True
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import logging
-from collections import OrderedDict
 from enum import Enum
 
 from paddle.base import core
@@ -21,7 +20,6 @@ from paddle.base.framework import Operator, Parameter, Program, get_flags
 from paddle.distributed.auto_parallel.static.utils import (
     get_logger,
     is_backward_op,
-    is_forward_op,
     is_optimize_op,
     use_new_executor,
 )
@@ -37,6 +35,23 @@ __not_shape_var_type__ = [
 
 logger = get_logger(logging.INFO)
 
+_SEND_RECV_OPS = frozenset(["send_v2", "recv_v2"])
+_FETCH_OPS = frozenset(["fetch", "fetch_v2"])
+
+_OP_ROLE_FORWARD_INT = int(OpRole.Forward)
+_OP_ROLE_BACKWARD_INT = int(OpRole.Backward)
+_OP_ROLE_OPTIMIZE_INT = int(OpRole.Optimize)
+_OP_ROLE_LOSS_INT = int(OpRole.Loss)
+
+# Whether an op type registers a no_need_buffer inferer, keyed by op type.
+# Most op types do not, and their no_need_buffer slots are always empty.
+_HAS_NO_NEED_BUFFER_INFERER = {}
+
+# The op types skipped when collecting the vars that can not be gc.
+_SKIP_GC_OPS = frozenset(
+    ["c_sync_comm_stream", "conditional_block", "nop", "while"]
+)
+
 
 # NOTE: Here stream is just a presentation with different name,
 # it is up to executor to create the exact streams given the name.
@@ -46,11 +61,10 @@ class AutoParallelStreamType(Enum):
     SHARDING_STREAM = "auto_parallel_sharding"
 
 
+# NOTE: dict keeps the insertion order, so it is used as an ordered set.
 def list_to_ordered_dict(list_obj, ordered_dict=None):
     if ordered_dict is None:
-        ordered_dict = OrderedDict()
-    else:
-        assert isinstance(ordered_dict, OrderedDict)
+        ordered_dict = {}
     for obj in list_obj:
         if obj not in ordered_dict:
             ordered_dict[obj] = True
@@ -60,24 +74,65 @@ def list_to_ordered_dict(list_obj, ordered_dict=None):
 # The inputs of a program are the variables
 # that first occur as the input of the op.
 def get_inputs_of_program(program):
-    visited_vars = set()
-    input_vars = []
+    input_vars = {}
+    output_vars = set()
     for op in program.global_block().ops:
         for in_var_name in op.input_arg_names:
-            if in_var_name not in visited_vars:
-                input_vars.append(in_var_name)
-                visited_vars.add(in_var_name)
+            if in_var_name not in output_vars:
+                input_vars[in_var_name] = True
 
-        for out_var_name in op.output_arg_names:
-            visited_vars.add(out_var_name)
-    return input_vars
+        output_vars.update(op.output_arg_names)
+    return list(input_vars)
 
 
-def get_outputs_of_program(program):
-    output_vars = OrderedDict()
+def _get_ordered_outputs_of_program(program):
+    output_vars = {}
     for op in program.global_block().ops:
         list_to_ordered_dict(op.output_arg_names, output_vars)
-    return list(output_vars.keys())
+    return output_vars
+
+
+def get_outputs_of_program(program):
+    return list(_get_ordered_outputs_of_program(program))
+
+
+def _prune_single_block_program(program, start_op_idx, end_op_idx):
+    """
+    Same as pruning a clone of program, but only the kept op descs and the
+    var descs they use are copied. The program attrs and the param, data
+    and dist info are copied as Program.clone does.
+    """
+    src_block = program.global_block()
+    kept_ops = src_block.ops[start_op_idx:end_op_idx]
+
+    pruned_program = Program()
+    pruned_program._seed = program._seed
+    pruned_program._current_role = program._current_role
+    pruned_program._appending_grad_times = program._appending_grad_times
+    for attr_name in ('lr_scheduler', '_pipeline_opt', '_pass_opt'):
+        if hasattr(program, attr_name):
+            setattr(pruned_program, attr_name, getattr(program, attr_name))
+
+    dst_block_desc = pruned_program.global_block().desc
+    visited_vars = set()
+    for op in kept_ops:
+        dst_block_desc.append_op().copy_from(op.desc)
+        for var_name in op.input_arg_names + op.output_arg_names:
+            if var_name in visited_vars:
+                continue
+            visited_vars.add(var_name)
+            var_desc = src_block.desc.find_var(var_name.encode())
+            if var_desc is not None:
+                dst_block_desc._clone_var(var_desc)
+    pruned_program._sync_with_cpp()
+
+    pruned_program._copy_param_info_from(program)
+    pruned_program._copy_data_info_from(program)
+    pruned_program._copy_dist_param_info_from(program)
+    for dst_op, src_op in zip(pruned_program.global_block().ops, kept_ops):
+        dst_op.set_amp_options(src_op.amp_options)
+    pruned_program._name_generator = program._name_generator.clone()
+    return pruned_program
 
 
 def prune_program(program, start_op_idx, end_op_idx):
@@ -90,27 +145,27 @@ def prune_program(program, start_op_idx, end_op_idx):
     assert end_op_idx >= 0 and end_op_idx <= op_num, end_op_idx
     assert start_op_idx < end_op_idx
 
+    if program.num_blocks == 1:
+        return _prune_single_block_program(program, start_op_idx, end_op_idx)
+
+    # NOTE: the sub blocks used by the control flow ops are kept by cloning.
     program = program.clone()
-    for idx in range(op_num - 1, end_op_idx - 1, -1):
-        program.global_block()._remove_op(idx, sync=False)
-    for idx in range(start_op_idx - 1, -1, -1):
-        program.global_block()._remove_op(idx, sync=False)
+    block = program.global_block()
+    # remove the tail and the head ops as two ranges instead of one by one
+    block.desc._remove_op(end_op_idx, op_num)
+    del block.ops[end_op_idx:]
+    block.desc._remove_op(0, start_op_idx)
+    del block.ops[:start_op_idx]
     program._sync_with_cpp()
 
     valid_vars = set()
-    for op in program.global_block().ops:
-        for in_var_name in op.input_arg_names:
-            valid_vars.add(in_var_name)
-        for out_var_name in op.output_arg_names:
-            valid_vars.add(out_var_name)
-
-    vars_to_remove = []
-    for var in program.global_block().vars:
-        if var not in valid_vars:
-            vars_to_remove.append(var)
+    for op in block.ops:
+        valid_vars.update(op.input_arg_names)
+        valid_vars.update(op.output_arg_names)
 
+    vars_to_remove = [var for var in block.vars if var not in valid_vars]
     for var in vars_to_remove:
-        program.global_block()._remove_var(var, sync=False)
+        block._remove_var(var, sync=False)
     program._sync_with_cpp()
     return program
 
@@ -151,18 +206,21 @@ def split_program(program, op_indices):
     num_split = len(splitted_programs)
     input_vars = [get_inputs_of_program(p) for p in splitted_programs]
     output_vars = [
-        list_to_ordered_dict(get_outputs_of_program(p))
-        for p in splitted_programs
+        _get_ordered_outputs_of_program(p) for p in splitted_programs
     ]
-    valid_output_vars = [OrderedDict() for _ in range(num_split)]
+    valid_output_vars = [{} for _ in range(num_split)]
     valid_output_vars[-1] = output_vars[-1]
-    for i in range(1, num_split):
+    # the index of the last splitted program before the i-th one that
+    # outputs the var
+    producer_idx = {}
+    for i in range(num_split):
         for in_var_name in input_vars[i]:
-            for j in reversed(range(i)):
-                if in_var_name in output_vars[j]:
-                    valid_output_vars[j][in_var_name] = True
-                    break
-    valid_output_vars = [list(item.keys()) for item in valid_output_vars]
+            j = producer_idx.get(in_var_name)
+            if j is not None:
+                valid_output_vars[j][in_var_name] = True
+        for out_var_name in output_vars[i]:
+            producer_idx[out_var_name] = i
+    valid_output_vars = [list(item) for item in valid_output_vars]
     return splitted_programs, input_vars, valid_output_vars
 
 
@@ -173,6 +231,8 @@ class OpInOutInfo:
 
     def __init__(self):
         self._is_build = False
+        # all the args are needed unless the op has no_need_buffer slots
+        self._all_needed = True
         self._no_need_buffer_slots = set()
         self._other_arg_names_set = set()
 
@@ -181,43 +241,41 @@ class OpInOutInfo:
         return self._is_build
 
     def _get_op_attrs(self, op):
-        inputs = {}
-        for input_name in op.input_names:
-            inputs[input_name] = op.input(input_name)
-        outputs = {}
-        for output_name in op.output_names:
-            outputs[output_name] = op.output(output_name)
-        attrs = {}
-        for attr_name in op.attr_names:
-            attrs[attr_name] = op.attr(attr_name)
+        inputs = {name: op.input(name) for name in op.input_names}
+        outputs = {name: op.output(name) for name in op.output_names}
+        attrs = {name: op.attr(name) for name in op.attr_names}
 
         return inputs, outputs, attrs
 
     def build_info(self, op):
+        op_type = op.type
+        has_inferer = _HAS_NO_NEED_BUFFER_INFERER.get(op_type)
+        if has_inferer is None:
+            has_inferer = core.has_no_need_buffer_vars_inferer(op_type)
+            _HAS_NO_NEED_BUFFER_INFERER[op_type] = has_inferer
+        if not has_inferer:
+            return
+
         inputs, outputs, attrs = self._get_op_attrs(op)
         self._no_need_buffer_slots = core.infer_no_need_buffer_slots(
-            op.type, inputs, outputs, attrs
+            op_type, inputs, outputs, attrs
         )
         if len(self._no_need_buffer_slots) == 0:
             return
 
-        for slot_name in op.input_names:
+        self._all_needed = False
+        for slot_name, in_names in inputs.items():
             if slot_name not in self._no_need_buffer_slots:
-                for in_name in op.input(slot_name):
-                    self._other_arg_names_set.add(in_name)
+                self._other_arg_names_set.update(in_names)
 
-        for slot_name in op.output_names:
+        for slot_name, out_names in outputs.items():
             if slot_name not in self._no_need_buffer_slots:
-                for out_name in op.output(slot_name):
-                    self._other_arg_names_set.add(out_name)
+                self._other_arg_names_set.update(out_names)
 
         self._is_build = True
 
     def is_needed(self, arg_name):
-        return (
-            len(self._no_need_buffer_slots) == 0
-            or arg_name in self._other_arg_names_set
-        )
+        return self._all_needed or arg_name in self._other_arg_names_set
 
 
 def var_can_be_deleted(var_name, block):
@@ -225,38 +283,66 @@ def var_can_be_deleted(var_name, block):
     return var is not None and not var.persistable
 
 
-def prepare_ir_program(cur_prog, next_prog):
-    set_output_names = set()
-    for op in cur_prog.global_block().ops:
-        for arg_name in op.output_arg_names:
-            if var_can_be_deleted(arg_name, cur_prog.global_block()):
-                set_output_names.add(arg_name)
+def _make_var_can_be_deleted_cache():
+    """
+    Return a `var_can_be_deleted` that memoizes the results by block and
+    var name, it should only be used while the vars are not changed.
+    """
+    cache = {}
+
+    def _var_can_be_deleted(var_name, block):
+        key = (id(block), var_name)
+        can_be_deleted = cache.get(key)
+        if can_be_deleted is None:
+            can_be_deleted = var_can_be_deleted(var_name, block)
+            cache[key] = can_be_deleted
+        return can_be_deleted
+
+    return _var_can_be_deleted
+
 
+def prepare_ir_program(cur_prog, next_prog):
+    _var_can_be_deleted = _make_var_can_be_deleted_cache()
     set_input_names = set()
     for op in next_prog.global_block().ops:
         for arg_name in op.input_arg_names:
-            if var_can_be_deleted(arg_name, next_prog.global_block()):
+            if _var_can_be_deleted(arg_name, next_prog.global_block()):
                 set_input_names.add(arg_name)
 
-    shadow_var_names = sorted(set_output_names & set_input_names)
+    # only the outputs of cur_prog that are used as inputs of next_prog
+    set_shadow_names = set()
+    for op in cur_prog.global_block().ops:
+        for arg_name in op.output_arg_names:
+            if arg_name in set_input_names and _var_can_be_deleted(
+                arg_name, cur_prog.global_block()
+            ):
+                set_shadow_names.add(arg_name)
+
+    shadow_var_names = sorted(set_shadow_names)
+    cur_block = cur_prog.global_block()
+    next_block = next_prog.global_block()
+    shadow_ops = []
+    data_ops = []
     for var_name in shadow_var_names:
-        shadow_op_desc = cur_prog.global_block().desc.append_op()
+        shadow_op_desc = cur_block.desc.append_op()
         shadow_op_desc.set_type("shadow_output")
         shadow_op_desc.set_input('x', [var_name])
         shadow_op_desc.set_output('out', ["@EMPTY@"])
         shadow_op_desc._set_attr("name", var_name)
-        shadow_op = Operator(cur_prog.global_block(), shadow_op_desc)
-        cur_prog.global_block().ops.append(shadow_op)
+        shadow_ops.append(Operator(cur_block, shadow_op_desc))
 
-        data_op_desc = next_prog.global_block().desc._prepend_op()
+        data_op_desc = next_block.desc._prepend_op()
         data_op_desc.set_type("data")
         data_op_desc._set_attr("shape", [])
         data_op_desc._set_attr("dtype", 0)
         data_op_desc._set_attr("place", 2)  # GPUPlace
         data_op_desc._set_attr("name", var_name)
         data_op_desc.set_output("out", [var_name])
-        data_op = Operator(next_prog.global_block(), data_op_desc)
-        next_prog.global_block().ops.insert(0, data_op)
+        data_ops.append(Operator(next_block, data_op_desc))
+
+    # NOTE: every data op is prepended, so they are in reverse order in desc.
+    cur_block.ops.extend(shadow_ops)
+    next_block.ops[0:0] = data_ops[::-1]
 
     cur_prog._sync_with_cpp()
     next_prog._sync_with_cpp()
@@ -275,25 +361,28 @@ def set_skip_gc_vars(num_micro_batches, job_types, sub_programs, jobs):
 
     # step1: Get all vars of every sub_program that are non-persistable and not in op's no_need_buffer.
     type_to_required_vars = {}
+    _var_can_be_deleted = _make_var_can_be_deleted_cache()
     for type, program in type_to_program.items():
-        type_to_required_vars[type] = set()
+        required_vars = set()
+        type_to_required_vars[type] = required_vars
         for block in program.blocks:
             for op in block.ops:
-                if op.type in [
-                    "c_sync_comm_stream",
-                    "conditional_block",
-                    "nop",
-                    "while",
-                ]:
+                if op.type in _SKIP_GC_OPS:
+                    continue
+
+                input_arg_names = op.input_arg_names
+                output_arg_names = op.output_arg_names
+                if not input_arg_names and not output_arg_names:
                     continue
 
                 op_info = OpInOutInfo()
                 op_info.build_info(op)
-                for arg_name in op.input_arg_names + op.output_arg_names:
-                    if var_can_be_deleted(
-                        arg_name, block
-                    ) and op_info.is_needed(arg_name):
-                        type_to_required_vars[type].add(arg_name)
+                for arg_names in (input_arg_names, output_arg_names):
+                    for arg_name in arg_names:
+                        if _var_can_be_deleted(
+                            arg_name, block
+                        ) and op_info.is_needed(arg_name):
+                            required_vars.add(arg_name)
 
     # step2: Set `skip_gc_vars` for each job
     suffixed_required_vars = [set() for i in range(num_micro_batches)]
@@ -303,9 +392,16 @@ def set_skip_gc_vars(num_micro_batches, job_types, sub_programs, jobs):
         job_type = job.type()
         required_vars = type_to_required_vars[job_type]
         micro_batch_id = job.micro_batch_id()
-        skip_gc_vars = required_vars & suffixed_required_vars[micro_batch_id]
+        suffixed_vars = suffixed_required_vars[micro_batch_id]
+        if required_vars and suffixed_vars:
+            skip_gc_vars = required_vars & suffixed_vars
+        else:
+            skip_gc_vars = set()
         logger.debug(
-            f"Skip gc vars for {job_type}-({micro_batch_id}): {skip_gc_vars}"
+            "Skip gc vars for %s-(%s): %s",
+            job_type,
+            micro_batch_id,
+            skip_gc_vars,
         )
 
         if job_type == "backward":
@@ -314,7 +410,7 @@ def set_skip_gc_vars(num_micro_batches, job_types, sub_programs, jobs):
             ), f"When enabling pipeline parallelism stategy, the skip_gc_vars for backward subprogram must be empty, but it is {skip_gc_vars}."
 
         job.set_skip_gc_vars(skip_gc_vars)
-        suffixed_required_vars[micro_batch_id] |= required_vars
+        suffixed_vars |= required_vars
 
     if get_flags("FLAGS_enable_pir_in_executor")[
         'FLAGS_enable_pir_in_executor'
@@ -330,13 +426,20 @@ def set_skip_gc_vars(num_micro_batches, job_types, sub_programs, jobs):
     return type_to_program
 
 
+# The python attributes of a Parameter that are copied by `_create_param`.
+_PARAM_COPIED_ATTRS = (
+    'trainable',
+    'optimize_attr',
+    'regularizer',
+    'do_model_average',
+    'need_clip',
+)
+
+
 def _create_param(dst_block, src_var):
-    copied_kwargs = {}
-    copied_kwargs['trainable'] = src_var.trainable
-    copied_kwargs['optimize_attr'] = src_var.optimize_attr
-    copied_kwargs['regularizer'] = src_var.regularizer
-    copied_kwargs['do_model_average'] = src_var.do_model_average
-    copied_kwargs['need_clip'] = src_var.need_clip
+    copied_kwargs = {
+        name: getattr(src_var, name) for name in _PARAM_COPIED_ATTRS
+    }
 
     Parameter(
         block=dst_block,
@@ -391,15 +494,29 @@ def _create_var(src_block, dst_block, src_varname, force_create=False):
             _create_inter(dst_block, src_var)
 
 
-def _create_program(src_block, dst_block, src_op, force_create=False):
+def _create_program(
+    src_block, dst_block, src_op, force_create=False, visited_vars=None
+):
+    """
+    Copy src_op into dst_block and create the vars it uses. If visited_vars
+    is given, the var names in it are skipped and the handled ones are added.
+    """
     dst_op_desc = dst_block.desc.append_op()
     dst_op_desc.copy_from(src_op.desc)
     for input_varname in src_op.input_arg_names:
+        if visited_vars is not None:
+            if input_varname in visited_vars:
+                continue
+            visited_vars.add(input_varname)
         if src_block.has_var(input_varname) or (
             force_create and src_block._find_var_recursive(input_varname)
         ):
             _create_var(src_block, dst_block, input_varname, force_create)
     for output_varname in src_op.output_arg_names:
+        if visited_vars is not None:
+            if output_varname in visited_vars:
+                continue
+            visited_vars.add(output_varname)
         if src_block.has_var(output_varname) or (
             force_create and src_block._find_var_recursive(output_varname)
         ):
@@ -416,21 +533,29 @@ def _insert_sync_for_fthenb_1f1b(program):
     for block in program.blocks:
         offset = 0
         first_optimize_index = None
-        for index, op in enumerate(list(block.ops)):
+        for index, op in enumerate(block.ops):
             if is_optimize_op(op):
                 first_optimize_index = index
                 break
 
+        # NOTE: only the send/recv ops and their original indices are kept,
+        # since the ops are inserted into block.ops while iterating.
+        send_recv_ops = [
+            (index, op, op.type)
+            for index, op in enumerate(block.ops)
+            if op.type in _SEND_RECV_OPS
+        ]
+
         # insert sync ops
-        for index, op in enumerate(list(block.ops)):
+        for index, op, op_type in send_recv_ops:
             # NOTE: pipeline might hang when dynamic_shape is True
-            if op.type in ['send_v2', 'recv_v2']:
-                op._set_attr("dynamic_shape", False)
+            op._set_attr("dynamic_shape", False)
             # set send op on comm stream
-            if op.type == 'send_v2':
+            if op_type == 'send_v2':
                 # step1: set 'use_calc_stream' False
                 op._set_attr("use_calc_stream", False)
                 op_role = op.attr('op_role')
+                op_role_int = int(op_role)
                 ring_id = op.attr('ring_id')
                 # step2: insert 'c_sync_calc_stream' op before 'send_v2' op
                 var_name = op.input_arg_names[0]
@@ -445,7 +570,7 @@ def _insert_sync_for_fthenb_1f1b(program):
                 offset += 1
                 # step3: insert 'c_sync_comm_stream' op after 'send_v2' op or
                 # before the first optimize op
-                if int(op_role) == int(OpRole.Backward):
+                if op_role_int == _OP_ROLE_BACKWARD_INT:
                     index = first_optimize_index + offset
                     new_op_role = OpRole.Optimize
                 else:
@@ -463,7 +588,7 @@ def _insert_sync_for_fthenb_1f1b(program):
                 )
                 # step4: If 'send_v2' op in forward parse, set 'pipeline_flag' to distinguish
                 # whether the 'c_sync_comm_stream' op is inserted for pipeline.
-                if int(op_role) == int(OpRole.Forward):
+                if op_role_int == _OP_ROLE_FORWARD_INT:
                     sync_comm_op._set_attr('pipeline_flag', '')
                     offset += 1
         block._sync_with_cpp()
@@ -479,9 +604,7 @@ def _insert_sync_for_fthenb_1f1b(program):
 
         # replace 'c_sync_comm_stream' op with 'nop' op
         # use nop op for gc
-        for index, op in enumerate(list(block.ops)):
-            if index >= backward_recv_index:
-                break
+        for index, op in enumerate(block.ops[:backward_recv_index]):
             if op.type == 'c_sync_comm_stream' and op.has_attr('pipeline_flag'):
                 var_name = op.output_arg_names[0]
                 var = block.var(var_name)
@@ -499,6 +622,18 @@ def _insert_sync_for_fthenb_1f1b(program):
         block._sync_with_cpp()
 
 
+# The execution stream names of send_v2 ops, keyed by ring_id.
+_SEND_STREAM_NAMES = {}
+
+
+def _get_send_stream_name(ring_id):
+    stream_name = _SEND_STREAM_NAMES.get(ring_id)
+    if stream_name is None:
+        stream_name = "send_stream_" + str(ring_id)
+        _SEND_STREAM_NAMES[ring_id] = stream_name
+    return stream_name
+
+
 def _overlap_send_recv(program):
     """
     This function is used to replace the function '_insert_sync_for_fthenb_1f1b'.
@@ -509,17 +644,20 @@ def _overlap_send_recv(program):
     """
     for block in program.blocks:
         for op in block.ops:
-            if op.type == 'send_v2':
+            op_type = op.type
+            if op_type == 'send_v2':
                 op._set_attr("dynamic_shape", False)
                 op._set_attr("use_calc_stream", True)
                 ring_id = op.attr("ring_id")
-                op.dist_attr.execution_stream = "send_stream_" + str(ring_id)
-                op.dist_attr.stream_priority = 0
-            elif op.type == 'recv_v2':
+                dist_attr = op.dist_attr
+                dist_attr.execution_stream = _get_send_stream_name(ring_id)
+                dist_attr.stream_priority = 0
+            elif op_type == 'recv_v2':
                 op._set_attr("dynamic_shape", False)
                 op._set_attr("use_calc_stream", True)
-                op.dist_attr.execution_stream = "recv_stream"
-                op.dist_attr.stream_priority = 0
+                dist_attr = op.dist_attr
+                dist_attr.execution_stream = "recv_stream"
+                dist_attr.stream_priority = 0
             else:
                 pass
 
@@ -537,37 +675,40 @@ def _program_for_fthenb_and_1f1b(program, enable_send_recv_overlap=False):
     bwd_prog = Program()
     opt_prog = Program()
 
-    def _is_fetch_op(op):
-        return op.type in ["fetch", "fetch_v2"]
-
     # split the program based on the op_role
     def _split_ops(block):
         fwd_ops = []
         bwd_ops = []
         opt_ops = []
-        for op in src_block.ops:
-            if _is_fetch_op(op):
+        fetch_ops = []
+        for op in block.ops:
+            if op.type in _FETCH_OPS:
+                fetch_ops.append(op)
                 continue
-            if is_forward_op(op):
+            # NOTE: the same checks as is_forward_op, is_backward_op and
+            # is_optimize_op, with the op_role read only once.
+            op_role = int(op.attr('op_role'))
+            if op_role == _OP_ROLE_FORWARD_INT or op_role == _OP_ROLE_LOSS_INT:
                 fwd_ops.append(op)
-            elif is_backward_op(op):
+            elif op_role & _OP_ROLE_BACKWARD_INT:
                 bwd_ops.append(op)
-            elif is_optimize_op(op):
+            elif op_role & _OP_ROLE_OPTIMIZE_INT:
                 opt_ops.append(op)
             else:
                 raise ValueError(
                     "The op role: "
-                    + str(op.attr('op_role'))
+                    + str(op_role)
                     + " isn't one of Forward, Backward or Optimizer."
                 )
-        return fwd_ops, bwd_ops, opt_ops
+        return fwd_ops, bwd_ops, opt_ops, fetch_ops
 
     def _add_ops_into_block(src_block, dst_block, ops):
+        visited_vars = set()
         for op in ops:
-            _create_program(src_block, dst_block, op)
+            _create_program(src_block, dst_block, op, visited_vars=visited_vars)
 
     for idx, src_block in enumerate(program.blocks):
-        fwd_ops, bwd_ops, opt_ops = _split_ops(src_block)
+        fwd_ops, bwd_ops, opt_ops, fetch_ops = _split_ops(src_block)
         if idx == 0:
             fwd_block = fwd_prog.block(0)
             _add_ops_into_block(src_block, fwd_block, fwd_ops)
@@ -599,16 +740,16 @@ def _program_for_fthenb_and_1f1b(program, enable_send_recv_overlap=False):
                 opt_block._set_forward_block_idx(src_block.forward_block_idx)
                 _add_ops_into_block(src_block, opt_block, opt_ops)
 
-        for fetch_op in src_block.ops:
-            if fetch_op.type in ["fetch", "fetch_v2"]:
-                in_name = fetch_op.input_arg_names[0]
-                dst_block = None
-                for block in [fwd_block, bwd_block, opt_block]:
-                    if block._find_var_recursive(in_name):
-                        dst_block = block
-                        break
-                if dst_block:
-                    _create_program(src_block, dst_block, fetch_op)
+        candidate_blocks = (fwd_block, bwd_block, opt_block)
+        for fetch_op in fetch_ops:
+            in_name = fetch_op.input_arg_names[0]
+            dst_block = None
+            for block in candidate_blocks:
+                if block._find_var_recursive(in_name):
+                    dst_block = block
+                    break
+            if dst_block:
+                _create_program(src_block, dst_block, fetch_op)
 
     fwd_prog._sync_with_cpp()
     bwd_prog._sync_with_cpp()
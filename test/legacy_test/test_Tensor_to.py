@@ -14,6 +14,8 @@
 
 import unittest
 
+import numpy as np
+
 import paddle
 from paddle import base
 
@@ -103,6 +105,59 @@ class TensorToTest(unittest.TestCase):
         type2_str = str(tensor2.dtype)
         self.assertTrue(type2_str, "paddle.float16")
 
+    def test_Tensor_to_np_dtype(self):
+        tensorx = paddle.to_tensor([1, 2, 3], dtype="int32", place="cpu")
+        tensorx = tensorx.to(np.dtype("float64"))
+        self.assertEqual(tensorx.dtype, paddle.float64)
+        self.assertTrue(tensorx.place.is_cpu_place())
+        np.testing.assert_array_equal(tensorx.numpy(), [1.0, 2.0, 3.0])
+
+        tensorx = tensorx.to("cpu", np.dtype("int64"))
+        self.assertEqual(tensorx.dtype, paddle.int64)
+        np.testing.assert_array_equal(tensorx.numpy(), [1, 2, 3])
+
+    def test_Tensor_to_cast_and_copy(self):
+        data = np.array([1.5, -2.25, 3.0])
+        tensorx = paddle.to_tensor(data, dtype="float32", place="cpu")
+        tensorx = tensorx.to("cpu", "float64")
+        self.assertEqual(tensorx.dtype, paddle.float64)
+        np.testing.assert_array_equal(tensorx.numpy(), data)
+
+        if not base.core.is_compiled_with_cuda():
+            return
+        # (src dtype, dst dtype, blocking) for every order of cast and copy
+        cases = [
+            ("float16", "float32", True),
+            ("float16", "float32", False),
+            ("int32", "float64", True),
+            ("float64", "float16", True),
+            ("float64", "float16", False),
+        ]
+        for src_dtype, dst_dtype, blocking in cases:
+            expected = data.astype(src_dtype).astype(dst_dtype)
+            # gpu -> cpu
+            tensorx = paddle.to_tensor(data, dtype=src_dtype, place="gpu")
+            tensorx = tensorx.to("cpu", dst_dtype, blocking)
+            self.assertTrue(tensorx.place.is_cpu_place())
+            self.assertEqual(tensorx.dtype, getattr(paddle, dst_dtype))
+            np.testing.assert_array_equal(tensorx.numpy(), expected)
+            # cpu -> gpu
+            tensorx = paddle.to_tensor(data, dtype=src_dtype, place="cpu")
+            tensorx = tensorx.to("gpu", dst_dtype, blocking)
+            self.assertTrue(tensorx.place.is_gpu_place())
+            self.assertEqual(tensorx.dtype, getattr(paddle, dst_dtype))
+            np.testing.assert_array_equal(tensorx.numpy(), expected)
+
+    def test_cast_and_copy_to_same_place_and_dtype(self):
+        tensorx = paddle.to_tensor(
+            [1.0, 2.0], dtype="float32", place="cpu", stop_gradient=False
+        )
+        out = tensorx._cast_and_copy_to(tensorx.place, tensorx.dtype, True)
+        self.assertFalse(tensorx.stop_gradient)
+        self.assertTrue(out.stop_gradient)
+        self.assertNotEqual(out.name, tensorx.name)
+        np.testing.assert_array_equal(out.numpy(), tensorx.numpy())
+
     def test_Tensor_to_other(self):
         tensor1 = paddle.to_tensor([1, 2, 3], dtype="int8", place="cpu")
         tensor2 = paddle.to_tensor([1, 2, 3])
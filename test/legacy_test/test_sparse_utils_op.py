@@ -188,6 +188,76 @@ class TestSparseConvert(unittest.TestCase):
                 correct_x_grad, sparse_x_cpu.grad.values().numpy()
             )
 
+    def test_fully_dense_coo_to_dense(self):
+        x = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        for sparse_dim in [1, 2]:
+            dense_x = paddle.to_tensor(x, stop_gradient=False)
+            sparse_x = dense_x.to_sparse_coo(sparse_dim)
+            dense_tensor = sparse_x.to_dense()
+            np.testing.assert_array_equal(dense_tensor.numpy(), x)
+            dense_tensor.backward(paddle.ones_like(dense_tensor))
+            np.testing.assert_array_equal(dense_x.grad.numpy(), np.ones([2, 3]))
+
+    def test_transposed_fully_dense_coo_to_dense(self):
+        x = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], dtype='float32')
+        sparse_x = paddle.to_tensor(x).to_sparse_coo(2)
+        sparse_t = paddle.sparse.transpose(sparse_x, [1, 0])
+        dense_t = sparse_t.to_dense()
+        np.testing.assert_array_equal(dense_t.numpy(), x.T)
+        # the dense result does not share the storage of the sparse tensor
+        dense_t[0, 0] = 0.0
+        np.testing.assert_array_equal(sparse_t.values().numpy()[0], 1.0)
+
+    def test_coalesce_coalesced_coo(self):
+        x = [[0.0, 1.0, 0.0], [2.0, 0.0, 3.0]]
+        sparse_x = paddle.to_tensor(x).to_sparse_coo(2)
+        self.assertIs(sparse_x.coalesce(), sparse_x)
+
+        indices = paddle.to_tensor([[1, 0, 0], [0, 1, 1]], dtype='int32')
+        values = paddle.to_tensor([1.0, 2.0, 3.0], dtype='float32')
+        sparse_x = paddle.sparse.sparse_coo_tensor(indices, values)
+        out = sparse_x.coalesce()
+        np.testing.assert_array_equal(out.indices().numpy(), [[0, 1], [1, 0]])
+        np.testing.assert_array_equal(out.values().numpy(), [5.0, 1.0])
+
+    def test_coalesce_reordered_coo(self):
+        # transpose permutes the indices of a coalesced tensor
+        x = [[0.0, 1.0, 0.0], [2.0, 0.0, 3.0]]
+        sparse_x = paddle.to_tensor(x).to_sparse_coo(2)
+        out = paddle.sparse.transpose(sparse_x, [1, 0]).coalesce()
+        np.testing.assert_array_equal(
+            out.indices().numpy(), [[0, 1, 2], [1, 0, 1]]
+        )
+        np.testing.assert_array_equal(out.values().numpy(), [2.0, 1.0, 3.0])
+
+        # unary ops keep the unsorted indices of their input
+        indices = paddle.to_tensor([[1, 0, 0], [0, 1, 1]], dtype='int32')
+        values = paddle.to_tensor([1.0, 2.0, 3.0], dtype='float32')
+        sparse_x = paddle.sparse.sparse_coo_tensor(indices, values)
+        out = paddle.sparse.abs(sparse_x).coalesce()
+        np.testing.assert_array_equal(out.indices().numpy(), [[0, 1], [1, 0]])
+        np.testing.assert_array_equal(out.values().numpy(), [5.0, 1.0])
+
+    def test_coalesce_grad_of_unsorted_coo(self):
+        # the grads copy the unsorted, duplicated indices of x
+        indices = paddle.to_tensor([[1, 0, 0], [0, 1, 1]], dtype='int32')
+        values = paddle.to_tensor([1.0, 2.0, 3.0], dtype='float32')
+        x = paddle.sparse.sparse_coo_tensor(
+            indices, values, [2, 2], stop_gradient=False
+        )
+        x.to_dense().sum().backward()
+        out = x.grad.coalesce()
+        np.testing.assert_array_equal(out.indices().numpy(), [[0, 1], [1, 0]])
+        np.testing.assert_array_equal(out.values().numpy(), [2.0, 1.0])
+
+        x = paddle.sparse.sparse_coo_tensor(
+            indices, values, [2, 2], stop_gradient=False
+        )
+        x.values().sum().backward()
+        out = x.grad.coalesce()
+        np.testing.assert_array_equal(out.indices().numpy(), [[0, 1], [1, 0]])
+        np.testing.assert_array_equal(out.values().numpy(), [2.0, 1.0])
+
     def test_to_sparse_csr(self):
         x = [[0, 1, 0, 2], [0, 0, 3, 0], [4, 5, 0, 0]]
         crows = [0, 2, 3, 5]
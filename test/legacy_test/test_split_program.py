@@ -18,7 +18,12 @@ import numpy as np
 
 import paddle
 from paddle import nn
-from paddle.distributed.passes.pass_utils import split_program
+from paddle.distributed.passes.pass_utils import (
+    get_outputs_of_program,
+    prepare_ir_program,
+    prune_program,
+    split_program,
+)
 from paddle.vision.models import resnet18 as resnet
 
 
@@ -157,5 +162,201 @@ class TestSplitProgram(unittest.TestCase):
         return self.get_var_values(scope, startup_vars)
 
 
+class TestPruneProgram(unittest.TestCase):
+    def setUp(self):
+        paddle.enable_static()
+
+    def get_program(self):
+        main = paddle.static.Program()
+        startup = paddle.static.Program()
+        main.random_seed = 2023
+        with paddle.static.program_guard(main, startup):
+            x = paddle.static.data(name='x', shape=[4, 8], dtype='float32')
+            label = paddle.static.data(
+                name='label', shape=[4, 1], dtype='int64'
+            )
+            hidden = paddle.static.nn.fc(x, size=16, activation='relu')
+            pred = paddle.static.nn.fc(hidden, size=4)
+            loss = paddle.mean(nn.functional.cross_entropy(pred, label))
+            scheduler = paddle.optimizer.lr.StepDecay(0.1, step_size=2)
+            optimizer = paddle.optimizer.SGD(learning_rate=scheduler)
+            optimizer.minimize(loss)
+        main.global_block().var('x').desc.dist_attr.dims_mapping = [0, -1]
+        return main
+
+    def get_cond_program(self):
+        main = paddle.static.Program()
+        startup = paddle.static.Program()
+        with paddle.static.program_guard(main, startup):
+            x = paddle.static.data(name='x', shape=[1], dtype='float32')
+            y = paddle.static.nn.cond(
+                paddle.sum(x) > 0, lambda: x + 1.0, lambda: x - 1.0
+            )
+            z = paddle.scale(y, scale=2.0)
+            paddle.mean(z)
+        return main
+
+    def clone_and_prune(self, program, start_op_idx, end_op_idx):
+        program = program.clone()
+        block = program.global_block()
+        for idx in range(len(block.ops) - 1, end_op_idx - 1, -1):
+            block._remove_op(idx, sync=False)
+        for idx in range(start_op_idx - 1, -1, -1):
+            block._remove_op(idx, sync=False)
+        program._sync_with_cpp()
+
+        valid_vars = set()
+        for op in block.ops:
+            valid_vars.update(op.input_arg_names)
+            valid_vars.update(op.output_arg_names)
+        for var in list(block.vars):
+            if var not in valid_vars:
+                block._remove_var(var, sync=False)
+        program._sync_with_cpp()
+        return program
+
+    def get_op_attrs(self, op):
+        attrs = op.all_attrs()
+        # the sub blocks belong to different programs, compare their idx
+        if 'sub_block' in attrs:
+            attrs['sub_block'] = op._block_attr_id('sub_block')
+        return attrs
+
+    def check_same_program(self, actual, expected):
+        self.assertEqual(actual.num_blocks, expected.num_blocks)
+        self.assertEqual(actual._seed, expected._seed)
+        self.assertEqual(actual._current_role, expected._current_role)
+        self.assertEqual(
+            actual._appending_grad_times, expected._appending_grad_times
+        )
+        self.assertIs(
+            getattr(actual, 'lr_scheduler', None),
+            getattr(expected, 'lr_scheduler', None),
+        )
+
+        actual_block = actual.global_block()
+        expected_block = expected.global_block()
+        self.assertEqual(
+            [op.type for op in actual_block.ops],
+            [op.type for op in expected_block.ops],
+        )
+        for actual_op, expected_op in zip(actual_block.ops, expected_block.ops):
+            self.assertEqual(actual_op.input_names, expected_op.input_names)
+            self.assertEqual(
+                actual_op.input_arg_names, expected_op.input_arg_names
+            )
+            self.assertEqual(
+                actual_op.output_arg_names, expected_op.output_arg_names
+            )
+            self.assertEqual(
+                self.get_op_attrs(actual_op), self.get_op_attrs(expected_op)
+            )
+
+        self.assertEqual(sorted(actual_block.vars), sorted(expected_block.vars))
+        for name, expected_var in expected_block.vars.items():
+            actual_var = actual_block.var(name)
+            self.assertEqual(
+                type(actual_var).__name__, type(expected_var).__name__
+            )
+            self.assertEqual(actual_var.shape, expected_var.shape)
+            self.assertEqual(actual_var.dtype, expected_var.dtype)
+            self.assertEqual(actual_var.persistable, expected_var.persistable)
+            self.assertEqual(actual_var.is_data, expected_var.is_data)
+            self.assertEqual(
+                actual_var.stop_gradient, expected_var.stop_gradient
+            )
+            self.assertEqual(
+                actual_var.desc.need_check_feed(),
+                expected_var.desc.need_check_feed(),
+            )
+            self.assertEqual(
+                actual_var.desc.dist_attr.dims_mapping,
+                expected_var.desc.dist_attr.dims_mapping,
+            )
+
+    def test_prune_program_same_as_clone(self):
+        main = self.get_program()
+        op_num = len(main.global_block().ops)
+        for start, end in [(0, op_num), (0, 3), (3, op_num - 2), (-4, -1)]:
+            pruned = prune_program(main, start, end)
+            start = start + op_num if start < 0 else start
+            end = end + op_num if end < 0 else end
+            self.check_same_program(
+                pruned, self.clone_and_prune(main, start, end)
+            )
+        self.assertEqual(
+            main.global_block().var('x').desc.dist_attr.dims_mapping, [0, -1]
+        )
+
+    def test_prune_program_with_sub_blocks(self):
+        main = self.get_cond_program()
+        op_num = len(main.global_block().ops)
+        for start, end in [(0, op_num), (1, op_num - 1), (0, 1)]:
+            pruned = prune_program(main, start, end)
+            self.check_same_program(
+                pruned, self.clone_and_prune(main, start, end)
+            )
+
+    def test_split_program_output_vars(self):
+        main = self.get_program()
+        op_num = len(main.global_block().ops)
+        op_indices = [3, op_num // 2, op_num - 3]
+        programs, input_vars, output_vars = split_program(main, op_indices)
+
+        # every output used by a later split, taken from the last producer
+        all_output_vars = [get_outputs_of_program(p) for p in programs]
+        expected = [[] for _ in programs]
+        expected[-1] = all_output_vars[-1]
+        for i in range(1, len(programs)):
+            for in_var_name in input_vars[i]:
+                for j in reversed(range(i)):
+                    if in_var_name in all_output_vars[j]:
+                        if in_var_name not in expected[j]:
+                            expected[j].append(in_var_name)
+                        break
+        self.assertEqual(
+            [sorted(v) for v in output_vars], [sorted(v) for v in expected]
+        )
+
+        starts = [0] + op_indices
+        ends = op_indices + [op_num]
+        for program, start, end in zip(programs, starts, ends):
+            self.check_same_program(
+                program, self.clone_and_prune(main, start, end)
+            )
+
+    def test_prepare_ir_program(self):
+        main = self.get_program()
+        op_num = len(main.global_block().ops)
+        programs, _, _ = split_program(main, [op_num // 2])
+        cur_prog, next_prog = programs
+        cur_op_num = len(cur_prog.global_block().ops)
+        next_op_num = len(next_prog.global_block().ops)
+        prepare_ir_program(cur_prog, next_prog)
+
+        for program in [cur_prog, next_prog]:
+            block = program.global_block()
+            self.assertEqual(len(block.ops), block.desc.op_size())
+            for i, op in enumerate(block.ops):
+                self.assertEqual(op.desc.id(), block.desc.op(i).id())
+
+        shadow_ops = cur_prog.global_block().ops[cur_op_num:]
+        data_ops = next_prog.global_block().ops[:-next_op_num]
+        self.assertGreater(len(shadow_ops), 0)
+        self.assertEqual(len(shadow_ops), len(data_ops))
+        shadow_names = [op.attr("name") for op in shadow_ops]
+        self.assertEqual(shadow_names, sorted(shadow_names))
+        for op in shadow_ops:
+            self.assertEqual(op.type, "shadow_output")
+            self.assertEqual(op.input("x"), [op.attr("name")])
+        # the data ops are prepended one by one, so in reverse order
+        self.assertEqual(
+            [op.attr("name") for op in data_ops], shadow_names[::-1]
+        )
+        for op in data_ops:
+            self.assertEqual(op.type, "data")
+            self.assertEqual(op.output("out"), [op.attr("name")])
+
+
 if __name__ == "__main__":
     unittest.main()
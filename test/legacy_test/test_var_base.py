@@ -321,6 +321,36 @@ class TestVarBase(unittest.TestCase):
             check_with_place(core.CUDAPlace(0))
             check_with_place("gpu:0")
 
+    def test_item(self):
+        def check_with_place(place):
+            with base.dygraph.guard():
+                # (dtype, data, python type), 'uint16' is the numpy
+                # representation of bfloat16
+                cases = [
+                    ('bool', [[True, False], [False, True]], bool),
+                    ('int32', [[1, -2], [3, 4]], int),
+                    ('int64', [[1, -2], [3, 2**40]], int),
+                    ('float16', [[0.5, -1.5], [2.5, 3.0]], float),
+                    ('bfloat16', [[0.5, -1.5], [2.5, 3.0]], float),
+                    ('uint16', [[0.5, -1.5], [2.5, 3.0]], float),
+                    ('complex64', [[1 + 2j, 0], [3 - 1j, 4j]], complex),
+                ]
+                for dtype, data, py_type in cases:
+                    x = paddle.to_tensor(data, dtype=dtype, place=place)
+                    # coordinates and flat index of the same element
+                    self.assertEqual(x.item(1, 0), data[1][0])
+                    self.assertEqual(x.item(2), data[1][0])
+                    self.assertEqual(x.item(0, 1), data[0][1])
+                    self.assertIsInstance(x.item(1, 0), py_type)
+
+                    x = paddle.to_tensor(data[1][1], dtype=dtype, place=place)
+                    self.assertEqual(x.item(), data[1][1])
+                    self.assertIsInstance(x.item(), py_type)
+
+        check_with_place(core.CPUPlace())
+        if core.is_compiled_with_cuda():
+            check_with_place(core.CUDAPlace(0))
+
     def test_to_tensor_not_change_input_stop_gradient(self):
         with paddle.base.dygraph.guard(core.CPUPlace()):
             a = paddle.zeros([1024])